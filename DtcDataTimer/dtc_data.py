@@ -1,17 +1,13 @@
 import csv
 import logging
-import json
 import os
 import re
-import uuid
 
 import urllib.request
 
-from azure.storage.blob import BlobServiceClient, ContentSettings
-from io import StringIO
-from ..shared import csl_meta, output
+from azure.storage.blob import ContentSettings
+from ..shared import csl_meta, entity_id, output, request, storage
 
-connection_string = os.environ["CONNECTION_STRING"]
 csl_container = os.environ["CSL_CONTAINER"]
 source_abbr = 'dtc'
 
@@ -32,21 +28,47 @@ def main():
     })
 
     logging.info(f"Checking stat last updated {stat_debarred_url}")
-    stat_last_modified = csl_meta.get_meta_url_last_modified(f"{source_abbr}_stat", 'utf-8')
-    stat_response = urllib.request.urlopen(stat_debarred_url)
-    stat_latest_modified = extract_latest_modified(stat_response)
+    stat_validators = csl_meta.get_validators(f"{source_abbr}_stat", meta_fallback=False)
+    stat_response = request.urlopen_if_modified(stat_debarred_url, stat_validators, user_agent=None)
 
     logging.info(f"Checking admin last updated {admin_debarred_url}")
+    admin_validators = csl_meta.get_validators(f"{source_abbr}_admin", meta_fallback=False)
+    admin_response = request.urlopen_if_modified(admin_debarred_url, admin_validators, user_agent=None)
+
+    if stat_response is None and admin_response is None:
+        logging.info('Not modified since the last import. Skipping processing.')
+        csl_meta.log_import_outcome(source_abbr, 'skipped', 'not modified')
+        return 0
+    # Both files make up the list, so the unchanged one is still needed in full.
+    if stat_response is None:
+        stat_response = urllib.request.urlopen(stat_debarred_url)
+    if admin_response is None:
+        admin_response = urllib.request.urlopen(admin_debarred_url)
+
+    stat_last_modified = csl_meta.get_meta_url_last_modified(f"{source_abbr}_stat", 'utf-8')
+    stat_latest_modified = extract_latest_modified(stat_response)
     admin_last_modified = csl_meta.get_meta_url_last_modified(f"{source_abbr}_admin", 'utf-8')
-    admin_response = urllib.request.urlopen(admin_debarred_url)
     admin_latest_modified = extract_latest_modified(admin_response, r"\_(\d{1,2}\.\d{1,2}\.\d{2})")
 
     if stat_last_modified == stat_latest_modified and admin_last_modified == admin_latest_modified:
         logging.info('No new data. Skipping processing.')
+        csl_meta.log_import_outcome(source_abbr, 'skipped', 'same last modified')
+        return 0
+
+    stat_source, stat_digest = request.read_source(stat_response)
+    stat_source_validators = request.get_validators(stat_response, stat_digest)
+    admin_source, admin_digest = request.read_source(admin_response)
+    admin_source_validators = request.get_validators(admin_response, admin_digest)
+    if stat_digest == stat_validators.get('digest') and admin_digest == admin_validators.get('digest'):
+        logging.info('Source content unchanged. Skipping processing.')
+        blob_service_client = storage.get_blob_service_client()
+        csl_meta.upload_validators(blob_service_client, f"{source_abbr}_stat", stat_source_validators)
+        csl_meta.upload_validators(blob_service_client, f"{source_abbr}_admin", admin_source_validators)
+        csl_meta.log_import_outcome(source_abbr, 'skipped', 'same content')
         return 0
 
     logging.info('reading stat data')
-    stat_lines = [line.decode('utf-8-sig') for line in stat_response.readlines()]
+    stat_lines = [line.decode('utf-8-sig') for line in stat_source.readlines()]
     stat_csvfile = csv.DictReader(stat_lines)
     source_csv_fields = stat_csvfile.fieldnames
 
@@ -55,7 +77,7 @@ def main():
         raise ValueError("Actual headers differ from expected. Stat.")
 
     logging.info('reading admin data')
-    admin_lines = [line.decode('utf-8') for line in admin_response.readlines()]
+    admin_lines = [line.decode('utf-8') for line in admin_source.readlines()]
     admin_csvfile = csv.DictReader(admin_lines)
     admin_csv_fields = admin_csvfile.fieldnames
 
@@ -64,19 +86,13 @@ def main():
         raise ValueError("Actual headers differ from expected. Admin.")
 
     logging.info('Processing data')
-    csv_output = StringIO()
-    tsv_output = StringIO()
-    json_output = StringIO()
-    csv_writer = csv.DictWriter(csv_output, fieldnames=output.output_fields, dialect='unix')
-    tsv_writer = csv.DictWriter(tsv_output, fieldnames=output.output_fields, dialect='unix', delimiter='\t')
-    csv_writer.writeheader()
-    tsv_writer.writeheader()
-
-    doc_list = []
+    blob_service_client = storage.get_blob_service_client()
+    output_writer = output.blob_output_writer(blob_service_client, csl_container, source_abbr)
+    seen_ids = set()
     for row in stat_csvfile:
-        id = uuid.uuid4().hex
         name, alt_names = process_names(row['Party Name'])
         federal_register_notice = row['Corrected Notice'] if row['Corrected Notice'] else row['Federal Register Notice']
+        id = entity_id.make_entity_id(seen_ids, source_name, row['Party Name'], federal_register_notice)
         doc = {
                 '_id': id,
                 'alt_names': alt_names,
@@ -86,15 +102,14 @@ def main():
                 'source_list_url': source_information_url,
                 'source_information_url': source_information_url,
         }
-        csv_writer.writerow(doc)
-        tsv_writer.writerow(doc)
+        output_writer.write_row(doc)
         doc['id'] = doc['_id']
         del doc['_id']
         doc['alt_names'] = doc['alt_names'].split('; ') if doc['alt_names'] else []
-        doc_list.append(doc)
+        output_writer.write_doc(doc)
 
     for row in admin_csvfile:
-        id = uuid.uuid4().hex
+        id = entity_id.make_entity_id(seen_ids, source_name, row['Name'], row['Federal Register Notice'])
         doc = {
                 '_id': id,
                 'name': row['Name'],
@@ -104,35 +119,22 @@ def main():
                 'source_list_url': source_information_url,
                 'source_information_url': source_information_url,
         }
-        csv_writer.writerow(doc)
-        tsv_writer.writerow(doc)
+        output_writer.write_row(doc)
         doc['id'] = doc['_id']
         del doc['_id']
-        doc_list.append(doc)
-
-    json.dump(doc_list, json_output)
-    blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-    logging.info('Write csv file')
-    content_setting = ContentSettings(content_type='text/csv')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}.csv")
-    blob_client.upload_blob(csv_output.getvalue(), overwrite=True, content_settings=content_setting)
-    csv_output.close()
-    logging.info('Write tsv file')
-    content_setting = ContentSettings(content_type='text/tsv')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}.tsv")
-    blob_client.upload_blob(tsv_output.getvalue(), overwrite=True, content_settings=content_setting)
-    tsv_output.close()
-    logging.info('Write json file')
-    content_setting = ContentSettings(content_type='application/json')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}.json")
-    blob_client.upload_blob(json_output.getvalue(), overwrite=True, content_settings=content_setting)
-    json_output.close()
+        output_writer.write_doc(doc)
+
+    entity_count = output_writer.close()
+    logging.info(f'Processed {entity_count} entries')
     logging.info('Write last modified file')
     content_setting = ContentSettings(content_type='text/plain')
     blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}_stat_meta.txt")
-    blob_client.upload_blob(stat_latest_modified, overwrite=True, content_settings=content_setting)
+    blob_client.upload_blob(stat_latest_modified, overwrite=True, content_settings=content_setting, metadata={'last_modified': stat_latest_modified})
     blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}_admin_meta.txt")
-    blob_client.upload_blob(admin_latest_modified, overwrite=True, content_settings=content_setting)
+    blob_client.upload_blob(admin_latest_modified, overwrite=True, content_settings=content_setting, metadata={'last_modified': admin_latest_modified})
+    csl_meta.upload_validators(blob_service_client, f"{source_abbr}_stat", stat_source_validators)
+    csl_meta.upload_validators(blob_service_client, f"{source_abbr}_admin", admin_source_validators)
+    csl_meta.log_import_outcome(source_abbr, 'processed', f'{entity_count} entries')
 
 
 def extract_latest_modified(response, regex=r"\_(\d{8})\.csv"):
@@ -12,6 +12,6 @@ def main(mytimer: func.TimerRequest) -> None:
     if mytimer.past_due:
         logging.info('The timer is past due!')
 
-    treasury_importer.run_import('cap')
+    treasury_importer.run_consolidated_import()
 
     logging.info('Python timer trigger function ran at %s', utc_timestamp)
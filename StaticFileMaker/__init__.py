@@ -1,36 +1,38 @@
+import base64
 import datetime
+import hashlib
 import json
 import logging
 import os
 
 import urllib.request
 
+from concurrent.futures import ThreadPoolExecutor
+
 import azure.functions as func
-from azure.storage.blob import BlobServiceClient, ContentSettings
-from io import StringIO
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobBlock, BlobServiceClient, ContentSettings
 
-from ..shared import csl_meta
+from ..shared import csl_meta, output
 
 connection_string = os.environ['CONNECTION_STRING']
 csl_container = os.environ['CSL_CONTAINER']
 csl_static_container = os.environ['CSL_STATIC_CONTAINER']
-cap_meta_url = csl_meta.get_meta_url('cap')
-cmic_meta_url = csl_meta.get_meta_url('cmic')
-dpl_meta_url = csl_meta.get_meta_url('dpl')
-dtc_meta_url = csl_meta.get_meta_url('dtc')
-el_meta_url = csl_meta.get_meta_url('el')
-fse_meta_url = csl_meta.get_meta_url('fse')
-isn_meta_url = csl_meta.get_meta_url('isn')
-mbs_meta_url = csl_meta.get_meta_url('mbs')
-meu_meta_url = csl_meta.get_meta_url('meu')
-plc_meta_url = csl_meta.get_meta_url('plc')
-sdn_meta_url = csl_meta.get_meta_url('sdn')
-ssi_meta_url = csl_meta.get_meta_url('ssi')
-uvl_meta_url = csl_meta.get_meta_url('uvl')
+meta_source_abbrs = [
+    'cap', 'cmic', 'dpl', 'dtc_admin', 'dtc_stat', 'el', 'fse',
+    'isn', 'mbs', 'meu', 'plc', 'sdn', 'ssi', 'uvl'
+]
+meta_max_workers = 8
+meta_timeout = 10
 
 json_out = 'consolidated.json'
+delta_out = 'consolidated.delta.json'
+block_size = 4 * 1024 * 1024
+download_max_workers = 8
+download_max_concurrency = 4
 data_file_list = [
-    'cmic.json', 'cap.json', 'dpl.json',
+    'cap.json', 'cmic.json', 'dpl.json',
     'dtc.json', 'el.json', 'fse.json',
     'isn.json', 'mbs.json', 'meu.json',
     'plc.json',
@@ -44,43 +46,70 @@ def main(mytimer: func.TimerRequest) -> None:
 
     if mytimer.past_due:
         logging.info('The timer is past due!')
-    blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+    blob_service_client = BlobServiceClient.from_connection_string(
+        connection_string, max_single_get_size=block_size, max_chunk_get_size=block_size)
     container_client = blob_service_client.get_container_client(csl_container)
-    blobs_list = container_client.list_blobs()
-    json_output = StringIO()
-    doc_list = []
-    entity_count = 0
-    for blob in blobs_list:
-        if blob.name in data_file_list:
-            blob_client = container_client.get_blob_client(blob.name)
-            streamdownloader = blob_client.download_blob()
-            file = json.loads(streamdownloader.readall())
-            for element in file:
-                entity_count += 1
-                doc_list.append(element)
-
-    dtc_admin_last_modified = csl_meta.get_meta_url_last_modified('dtc_admin', 'utf-8-sig')
-    dtc_admin_date = datetime.datetime.strptime(dtc_admin_last_modified, '%m.%d.%y')
-    dtc_stat_last_modified = csl_meta.get_meta_url_last_modified('dtc_stat', 'utf-8-sig')
-    dtc_stat_date = datetime.datetime.strptime(dtc_stat_last_modified, '%Y%m%d')
+    blobs_list = list(container_client.list_blobs(include=['metadata']))
+    blob_dict = {blob.name: blob for blob in blobs_list}
+    data_blobs = [blob_dict[name] for name in data_file_list if name in blob_dict]
+    etags = {blob.name: blob.etag for blob in data_blobs}
+    digests = {blob.name: (blob.metadata or {}).get('digest', '') for blob in data_blobs}
+
+    blob_client = blob_service_client.get_blob_client(container=csl_static_container, blob=json_out)
+    manifest = get_manifest(blob_client)
+    if manifest.get('etags') == etags:
+        logging.info('No list changed since the last consolidation. Skipping processing.')
+        return
+
+    # consolidated.json is committed as a block list. Each list's array contents are
+    # copied into it as byte ranges, and a list that has not changed keeps its blocks.
+    committed_block_ids = get_committed_block_ids(blob_client) if manifest else set()
+    entity_counts = get_entity_counts(container_client, data_blobs, manifest)
+    block_list = [stage_block(blob_client, committed_block_ids, b'{"results": [', 'head')]
+    block_ranges = []
+    separator = False
+    for blob in data_blobs:
+        if not entity_counts[blob.name]:
+            continue
+        if separator:
+            block_list.append(stage_block(blob_client, committed_block_ids, b', ', blob.name, blob.etag, 'separator'))
+        for offset, length in get_array_content_ranges(blob.size):
+            block_id = make_block_id(blob.name, blob.etag, str(offset))
+            if block_id not in committed_block_ids:
+                block_ranges.append((blob, block_id, offset, length))
+            block_list.append(BlobBlock(block_id))
+        separator = True
+
+    logging.info(f'Staging {len(block_ranges)} blocks')
+    with ThreadPoolExecutor(max_workers=download_max_workers) as executor:
+        futures = [
+            executor.submit(stage_range, blob_client, container_client.get_blob_client(blob.name), blob.etag, block_id, offset, length)
+            for blob, block_id, offset, length in block_ranges
+        ]
+        for future in futures:
+            future.result()
+
+    last_modified = get_meta_last_modified(blobs_list)
+    dtc_admin_date = datetime.datetime.strptime(last_modified['dtc_admin'], '%m.%d.%y')
+    dtc_stat_date = datetime.datetime.strptime(last_modified['dtc_stat'], '%Y%m%d')
     dtc_date = dtc_admin_date if dtc_admin_date >= dtc_stat_date else dtc_stat_date
     dtc_updated = dtc_date.strftime('%Y-%m-%dT%H:%M:%S+00:00')
 
-    cap_updated = get_date(cap_meta_url)
-    cmic_updated = get_date(cmic_meta_url)
-    dpl_updated = get_date(dpl_meta_url)
-    el_updated = get_date(el_meta_url)
-    fse_updated = get_date(fse_meta_url)
-    isn_updated = get_date(isn_meta_url)
-    mbs_updated = get_date(mbs_meta_url)
-    meu_updated = get_date(meu_meta_url)
-    plc_updated = get_date(plc_meta_url)
-    sdn_updated = get_date(sdn_meta_url)
-    ssi_updated = get_date(ssi_meta_url)
-    uvl_updated = get_date(uvl_meta_url)
+    cap_updated = get_date(last_modified['cap'])
+    cmic_updated = get_date(last_modified['cmic'])
+    dpl_updated = get_date(last_modified['dpl'])
+    el_updated = get_date(last_modified['el'])
+    fse_updated = get_date(last_modified['fse'])
+    isn_updated = get_date(last_modified['isn'])
+    mbs_updated = get_date(last_modified['mbs'])
+    meu_updated = get_date(last_modified['meu'])
+    plc_updated = get_date(last_modified['plc'])
+    sdn_updated = get_date(last_modified['sdn'])
+    ssi_updated = get_date(last_modified['ssi'])
+    uvl_updated = get_date(last_modified['uvl'])
 
     doc_dict = {
-        "results": doc_list,
+        "results": [],
         "search_performed_at": utc_timestamp,
         "sources_used": [
             {
@@ -163,19 +192,166 @@ def main(mytimer: func.TimerRequest) -> None:
             }
         ],
         "offset": 0,
-        "total": entity_count
+        "total": sum(entity_counts.values())
     }
-    json.dump(doc_dict, json_output)
+    tail = ']' + json.dumps(doc_dict).split('[]', 1)[1]
+    block_list.append(stage_block(blob_client, set(), tail.encode(), 'tail', utc_timestamp))
 
     content_setting = ContentSettings(content_type='application/json')
-    blob_client = blob_service_client.get_blob_client(container=csl_static_container, blob=json_out)
-    blob_client.upload_blob(json_output.getvalue(), overwrite=True, content_settings=content_setting)
-    json_output.close()
+    committed = blob_client.commit_block_list(block_list, content_settings=content_setting)
+    write_compressed_variants(blob_service_client, blob_client, committed['etag'])
+    write_consolidated_delta(blob_service_client, container_client, blob_dict, data_blobs, manifest, digests, utc_timestamp)
+    # The manifest marks the consolidation complete, so it is only set once the variants
+    # and the delta are written.
+    manifest = {'etags': etags, 'entity_counts': entity_counts, 'digests': digests}
+    blob_client.set_blob_metadata({'manifest': json.dumps(manifest)})
 
     logging.info('Python timer trigger function ran at %s', utc_timestamp)
 
 
-def get_date(url):
-    res = urllib.request.urlopen(url).read().decode('utf-8').strip()
-    date = datetime.datetime.strptime(res, '%a, %d %b %Y %H:%M:%S %Z')
+def get_date(last_modified):
+    date = datetime.datetime.strptime(last_modified, '%a, %d %b %Y %H:%M:%S %Z')
     return date.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def get_meta_last_modified(blobs_list):
+    # Importers copy the meta file's value into its metadata, so the listing
+    # usually has every value and only older meta files are read over HTTP.
+    metadata_dict = {blob.name: blob.metadata or {} for blob in blobs_list}
+    last_modified = {}
+    unlisted_abbrs = []
+    for source_abbr in meta_source_abbrs:
+        metadata = metadata_dict.get(f'{source_abbr}_meta.txt', {})
+        if 'last_modified' in metadata:
+            last_modified[source_abbr] = metadata['last_modified']
+        else:
+            unlisted_abbrs.append(source_abbr)
+
+    if unlisted_abbrs:
+        with ThreadPoolExecutor(max_workers=min(meta_max_workers, len(unlisted_abbrs))) as executor:
+            last_modified.update(zip(unlisted_abbrs, executor.map(read_meta, unlisted_abbrs)))
+    return last_modified
+
+
+def read_meta(source_abbr):
+    meta_url = csl_meta.get_meta_url(source_abbr)
+    with urllib.request.urlopen(meta_url, timeout=meta_timeout) as response:
+        return response.read().decode('utf-8-sig').strip()
+
+
+def get_manifest(blob_client):
+    try:
+        properties = blob_client.get_blob_properties()
+    except ResourceNotFoundError:
+        return {}
+    return json.loads(properties.metadata.get('manifest', '{}'))
+
+
+def get_committed_block_ids(blob_client):
+    committed_blocks, _ = blob_client.get_block_list('committed')
+    return {block.id for block in committed_blocks}
+
+
+def make_block_id(*key):
+    digest = hashlib.sha256('\n'.join(key).encode()).hexdigest()
+    return base64.b64encode(digest.encode()).decode()
+
+
+def stage_block(blob_client, committed_block_ids, data, *key):
+    block_id = make_block_id(*key)
+    if block_id not in committed_block_ids:
+        blob_client.stage_block(block_id, data)
+    return BlobBlock(block_id)
+
+
+def get_entity_counts(container_client, data_blobs, manifest):
+    entity_counts = {}
+    uncounted_blobs = []
+    for blob in data_blobs:
+        metadata = blob.metadata or {}
+        if 'entity_count' in metadata:
+            entity_counts[blob.name] = int(metadata['entity_count'])
+        elif manifest.get('etags', {}).get(blob.name) == blob.etag:
+            entity_counts[blob.name] = manifest['entity_counts'][blob.name]
+        else:
+            uncounted_blobs.append(blob)
+
+    # Lists written before the importers recorded their entity count have to be parsed once.
+    if uncounted_blobs:
+        with ThreadPoolExecutor(max_workers=min(download_max_workers, len(uncounted_blobs))) as executor:
+            list_blob_clients = [container_client.get_blob_client(blob.name) for blob in uncounted_blobs]
+            counts = executor.map(count_entities, list_blob_clients)
+            entity_counts.update(zip([blob.name for blob in uncounted_blobs], counts))
+    return entity_counts
+
+
+def count_entities(list_blob_client):
+    data = list_blob_client.download_blob(max_concurrency=download_max_concurrency).readall()
+    return len(json.loads(data))
+
+
+def get_array_content_ranges(size):
+    # The lists are written by json.dump, so the array brackets are the first and last bytes.
+    end = size - 1
+    return [(offset, min(block_size, end - offset)) for offset in range(1, end, block_size)]
+
+
+def stage_range(blob_client, list_blob_client, etag, block_id, offset, length):
+    downloader = list_blob_client.download_blob(
+        offset=offset, length=length, etag=etag, match_condition=MatchConditions.IfNotModified)
+    blob_client.stage_block(block_id, downloader.readall())
+
+
+def write_compressed_variants(blob_service_client, blob_client, etag):
+    open_sink = output.blob_sinks(blob_service_client, csl_static_container)
+    compressed_sink = output.open_compressed_sinks(open_sink, json_out, 'application/json')
+    downloader = blob_client.download_blob(etag=etag, match_condition=MatchConditions.IfNotModified)
+    for chunk in downloader.chunks():
+        compressed_sink.write_bytes(chunk)
+    compressed_sink.close()
+
+
+def write_consolidated_delta(blob_service_client, container_client, blob_dict, data_blobs, manifest, digests, utc_timestamp):
+    # A list's delta can be passed on when it starts from the digest the last consolidation
+    # recorded. Any other changed list, e.g. one imported twice in between, is reloaded in full.
+    previous_etags = manifest.get('etags', {})
+    previous_digests = manifest.get('digests', {})
+    list_deltas = []
+    reload = []
+    for blob in data_blobs:
+        if previous_etags.get(blob.name) == blob.etag:
+            continue
+        source_abbr = blob.name[:-len('.json')]
+        delta_blob = blob_dict.get(f'{source_abbr}.delta.json')
+        delta_metadata = (delta_blob.metadata or {}) if delta_blob is not None else {}
+        if previous_digests.get(blob.name) and \
+                delta_metadata.get('previous_digest') == previous_digests[blob.name] and \
+                delta_metadata.get('digest') == digests[blob.name]:
+            list_deltas.append((source_abbr, delta_blob))
+        else:
+            reload.append(source_abbr)
+
+    open_sink = output.blob_sinks(blob_service_client, csl_static_container)
+    delta_sink = output.open_output_sinks(open_sink, delta_out, 'application/json')
+    delta_sink.write('{"changes": [')
+    change_count = 0
+    for source_abbr, delta_blob in list_deltas:
+        downloader = container_client.get_blob_client(delta_blob.name).download_blob(
+            etag=delta_blob.etag, match_condition=MatchConditions.IfNotModified)
+        for change in json.loads(downloader.readall())['changes']:
+            if change_count:
+                delta_sink.write(', ')
+            delta_sink.write(json.dumps({'list': source_abbr, **change}))
+            change_count += 1
+
+    previous_digest = output.get_digest(previous_digests) if previous_digests else None
+    digest = output.get_digest(digests)
+    delta_summary = {
+        'reload': reload,
+        'previous_digest': previous_digest,
+        'digest': digest,
+        'generated_at': utc_timestamp
+    }
+    delta_sink.write(f'], {json.dumps(delta_summary)[1:]}')
+    logging.info(f'Consolidated delta has {change_count} changes, lists to reload: {reload}')
+    delta_sink.close({'previous_digest': previous_digest or '', 'digest': digest})
@@ -0,0 +1,31 @@
+"""Imports function app modules the way the Functions host does.
+
+The host loads the app root as the ``__app__`` package, which is what lets the
+function folders use ``from ..shared import ...``.
+"""
+import importlib
+import os
+import sys
+import types
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARK_ENVIRONMENT = {
+    'DEFAULT_USER_AGENT': 'csl-importers-benchmark',
+    'CONNECTION_STRING': 'DefaultEndpointsProtocol=https;AccountName=benchmark;AccountKey=YmVuY2htYXJr;EndpointSuffix=core.windows.net',
+    'CSL_CONTAINER': 'csl',
+    'CSL_STATIC_CONTAINER': 'static',
+    'META_HOST_URL': 'http://127.0.0.1'
+}
+
+
+def import_app_module(name):
+    for key, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(key, value)
+    if APP_ROOT not in sys.path:
+        sys.path.insert(0, APP_ROOT)
+    if '__app__' not in sys.modules:
+        package = types.ModuleType('__app__')
+        package.__path__ = [APP_ROOT]
+        sys.modules['__app__'] = package
+    return importlib.import_module(f'__app__.{name}')
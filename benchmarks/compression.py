@@ -0,0 +1,86 @@
+"""Reports the size and CPU cost of the pre-compressed output variants per list.
+
+    python -m benchmarks.compression --sdn-entries 12000 --treasury-entries 5000
+    python -m benchmarks.compression path/to/sdn.json path/to/consolidated.json
+
+Without paths, synthetic SDN and Treasury lists are written through the output
+pipeline first. Each file is then compressed again in block-sized chunks with
+every configured Content-Encoding, as the sinks do, and timed with process CPU
+time. Brotli is only measured when the brotli package is installed.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from . import fixtures
+from .app import import_app_module
+
+
+def write_lists(directory, sdn_entries, treasury_entries, seed):
+    output = import_app_module('shared.output')
+    sdn_data = import_app_module('SdnDataTimer.sdn_data')
+    treasury_importer = import_app_module('shared.treasury_importer')
+    sanctions_list_parser = import_app_module('sanctions_list_parser')
+    treasury_metadata = import_app_module('shared.treasury_metadata')
+    open_sink = output.local_sinks(directory)
+
+    sdn_path = os.path.join(directory, 'sdn.xml')
+    with open(sdn_path, 'w', encoding='utf-8') as f:
+        fixtures.write_sdn_xml(f, sdn_entries, seed)
+    with open(sdn_path, 'rb') as source:
+        output.write_outputs(output.OutputWriter('sdn', open_sink), sdn_data.iter_outputs(source))
+
+    advanced_path = os.path.join(directory, 'cons_advanced.xml')
+    with open(advanced_path, 'w', encoding='utf-8') as f:
+        fixtures.write_advanced_xml(f, treasury_entries, seed)
+    list_outputs = {}
+    for source_abbr in treasury_metadata.SOURCES_DICT:
+        list_id = treasury_metadata.get_treasury_metadata(source_abbr)['list_id']
+        list_outputs[list_id] = treasury_importer.ListOutput(source_abbr, output.OutputWriter(source_abbr, open_sink))
+    processor = sanctions_list_parser.StreamingTreasuryProcessor(advanced_path)
+    for list_id, sanctions_entry in processor.iter_sanctions_entries(list_outputs.keys()):
+        list_outputs[list_id].write(sanctions_entry)
+    for list_output in list_outputs.values():
+        list_output.close()
+
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(('.csv', '.tsv', '.json')) and not name.endswith(('.metadata.json', '.hashes.json'))
+    )
+
+
+def measure(path, make_compressor, block_size):
+    compress, finish = make_compressor()
+    compressed_size = 0
+    start = time.process_time()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(block_size), b''):
+            compressed_size += len(compress(chunk))
+    compressed_size += len(finish())
+    return compressed_size, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--sdn-entries', type=int, default=12000)
+    parser.add_argument('--treasury-entries', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output = import_app_module('shared.output')
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = args.paths or write_lists(tmp, args.sdn_entries, args.treasury_entries, args.seed)
+        print(f'{"file":<16} {"encoding":<8} {"size MB":>9} {"compressed":>11} {"ratio":>6} {"CPU s":>7} {"MB/s":>7}')
+        for path in paths:
+            size = os.path.getsize(path)
+            for content_encoding, make_compressor in output.content_encodings.values():
+                compressed_size, cpu = measure(path, make_compressor, output.block_size)
+                throughput = size / 1e6 / cpu if cpu else float('inf')
+                print(f'{os.path.basename(path):<16} {content_encoding:<8} {size / 1e6:>9.2f} '
+                      f'{compressed_size / 1e6:>11.2f} {size / max(compressed_size, 1):>6.1f} {cpu:>7.3f} {throughput:>7.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Compares country_code.get_country_code with the if/elif implementation it replaced.
+
+    python -m benchmarks.country_code
+    python -m benchmarks.country_code --sdn-xml sdn.xml
+
+The vocabulary is every SDN country spelling plus every pycountry code and
+name, or the country values of a real sdn.xml when one is given. Both
+implementations must agree on every value before anything is timed.
+"""
+import argparse
+import time
+import xml.etree.ElementTree as ET
+
+import pycountry
+
+from . import fixtures
+from .app import import_app_module
+
+SDN_COUNTRY_TAGS = ('country', 'idCountry')
+
+
+def legacy_get_country_code(country_name):
+    if len(country_name) == 0:
+        return country_name
+    country_name = country_name.lower()
+    if country_name == 'brunei':
+        return 'BN'
+    elif country_name == 'bahamas, the':
+        return 'BS'
+    elif country_name == 'burma':
+        return 'MM'
+    elif country_name in ['cabo verde', 'cabo verde.  previously cape verde.']:
+        return 'CV'
+    elif country_name == 'cote d ivoire':
+        return 'CI'
+    elif country_name.lower() in ['congo, democratic republic of the', 'congo, republic of the']:
+        return 'CG'
+    elif country_name.lower() == "china":
+        return "CN"
+    elif country_name in ['crimea', 'crimea (occupied)', 'region: crimea']:
+        return 'crimea (occupied)'
+    elif country_name == 'the gambia':
+        return 'GM'
+    elif country_name in ['honk kong', 'kong kong']:
+        return 'HK'
+    elif country_name == 'iran':
+        return 'IR'
+    elif country_name.lower() in ['korea, north', 'north korea']:
+        return 'KP'
+    elif country_name.lower() in ['korea, south', 'south korea']:
+        return 'KR'
+    elif country_name.lower() == 'kosovo':
+        return 'XK'
+    elif country_name == 'macao':
+        return 'MO'
+    elif country_name == 'moracco':
+        return 'MA'
+    elif country_name.lower() == 'netherlands antilles':
+        return 'AN'
+    elif country_name.lower() == 'north macedonia, the republic of':
+        return 'MK'
+    elif country_name.lower() in ['palestinian', 'region: gaza', 'west bank']:
+        return 'PS'
+    elif country_name == 'russia':
+        return 'RU'
+    elif country_name == 'syria':
+        return 'SY'
+    elif country_name in ['uae', 'u.a.e.', 'united arab emirates (uae)']:
+        return 'AE'
+    else:
+        try:
+            return pycountry.countries.lookup(country_name).alpha_2
+        except LookupError:
+            return country_name
+
+
+def get_vocabulary(sdn_xml):
+    if sdn_xml:
+        vocabulary = set()
+        for _, element in ET.iterparse(sdn_xml):
+            if element.tag.rsplit('}', 1)[-1] in SDN_COUNTRY_TAGS and element.text:
+                vocabulary.add(element.text.strip())
+        return sorted(vocabulary)
+
+    vocabulary = set(fixtures.SDN_COUNTRY_VOCABULARY)
+    for country in pycountry.countries:
+        for field in ('alpha_2', 'alpha_3', 'name', 'numeric', 'official_name', 'common_name'):
+            value = getattr(country, field, None)
+            if value:
+                vocabulary.update([value, value.upper()])
+    vocabulary.update(['', 'Crimea', 'U.A.E.', 'Atlantis'])
+    return sorted(vocabulary)
+
+
+def time_calls(function, vocabulary, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for country_name in vocabulary:
+            function(country_name)
+    return (time.perf_counter() - start) / (repeat * len(vocabulary))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sdn-xml')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    country_code = import_app_module('shared.country_code')
+    vocabulary = get_vocabulary(args.sdn_xml)
+    mismatches = [
+        (country_name, legacy_get_country_code(country_name), country_code.get_country_code(country_name))
+        for country_name in vocabulary
+        if legacy_get_country_code(country_name) != country_code.get_country_code(country_name)
+    ]
+    if mismatches:
+        raise SystemExit(f'{len(mismatches)} mismatches, first: {mismatches[:5]}')
+
+    legacy = time_calls(legacy_get_country_code, vocabulary, args.repeat)
+    current = time_calls(country_code.get_country_code, vocabulary, args.repeat)
+    print(f'{len(vocabulary)} country values, identical results')
+    print(f'legacy: {legacy * 1e6:.2f} us/call')
+    print(f'table:  {current * 1e6:.2f} us/call ({legacy / current:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,543 @@
+"""Deterministic synthetic source files for the benchmarks.
+
+The generators only reproduce the parts of each format the importers read, so
+sizes are comparable to the published files but the content is made up.
+"""
+import csv
+import random
+
+from xml.sax.saxutils import escape, quoteattr
+
+ADVANCED_XML_NS = 'https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/ADVANCED_XML'
+
+NON_SDN_LIST_IDS = [91763, 92052, 91469, 91868, 91243, 91507]
+
+ALIAS_TYPES = {1400: 'A.K.A.', 1401: 'F.K.A.', 1403: 'Name'}
+COUNTRIES = {
+    11: ('AF', 'Afghanistan'), 12: ('CN', 'China'), 13: ('CU', 'Cuba'),
+    14: ('IR', 'Iran'), 15: ('LB', 'Lebanon'), 16: ('RU', 'Russia'),
+    17: ('SY', 'Syria'), 18: ('VE', 'Venezuela'), 19: ('AE', 'United Arab Emirates')
+}
+DETAIL_REFERENCES = {91526: 'Male', 91527: 'Female', 91528: 'Vessel'}
+DETAIL_TYPES = {1430: 'DATE', 1431: 'LOOKUP', 1432: 'TEXT', 1433: 'COUNTRY'}
+FEATURE_TYPES = {
+    8: ('Birthdate', 1430), 9: ('Place of Birth', 1432), 10: ('Citizenship Country', 1433),
+    25: ('Location', None), 224: ('Gender', 1431), 14: ('Website', 1432),
+    3: ('Nationality of Registration', 1433)
+}
+ID_REG_DOC_TYPES = {1571: 'Passport', 1584: 'Registration Number', 1596: 'Tax ID No.'}
+LIST_VALUES = {
+    91763: 'CAPTA List', 92052: 'NS-CMIC List', 91469: 'FSE List',
+    91868: 'NS-MBS List', 91243: 'NS-PLC List', 91507: 'SSI List'
+}
+LOC_PART_TYPES = {
+    1450: 'Unknown', 1451: 'ADDRESS1', 1452: 'ADDRESS2', 1453: 'ADDRESS3',
+    1454: 'CITY', 1455: 'STATE/PROVINCE', 1456: 'POSTAL CODE'
+}
+NAME_PART_TYPES = {1520: 'Last Name', 1521: 'First Name', 1525: 'Entity Name'}
+PARTY_SUB_TYPES = {1: ('Individual', 1), 4: ('Unknown', 2)}
+PARTY_TYPES = {1: 'Individual', 2: 'Entity'}
+SANCTIONS_PROGRAMS = {1: 'CUBA', 2: 'IRAN', 3: 'UKRAINE-EO13662', 4: 'CMIC-EO13959'}
+
+SYLLABLES = ['al', 'an', 'bar', 'cor', 'del', 'en', 'for', 'gan', 'hol', 'ir', 'kan', 'lo',
+             'mar', 'nov', 'or', 'pet', 'ra', 'sol', 'tan', 'vel', 'zar']
+
+
+def _word(rng, parts=3):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, parts))).capitalize()
+
+
+def _reference_value_sets():
+    parts = ['<ReferenceValueSets>', '<AliasTypeValues>']
+    parts.extend(f'<AliasType ID="{k}">{v}</AliasType>' for k, v in ALIAS_TYPES.items())
+    parts.append('</AliasTypeValues><CountryValues>')
+    parts.extend(f'<Country ID="{k}" ISO2="{iso2}">{escape(name)}</Country>' for k, (iso2, name) in COUNTRIES.items())
+    parts.append('</CountryValues><DetailReferenceValues>')
+    parts.extend(f'<DetailReference ID="{k}">{v}</DetailReference>' for k, v in DETAIL_REFERENCES.items())
+    parts.append('</DetailReferenceValues><DetailTypeValues>')
+    parts.extend(f'<DetailType ID="{k}">{v}</DetailType>' for k, v in DETAIL_TYPES.items())
+    parts.append('</DetailTypeValues><FeatureTypeValues>')
+    parts.extend(f'<FeatureType ID="{k}" FeatureTypeGroupID="1">{escape(v)}</FeatureType>'
+                 for k, (v, _) in FEATURE_TYPES.items())
+    parts.append('</FeatureTypeValues><IDRegDocTypeValues>')
+    parts.extend(f'<IDRegDocType ID="{k}">{escape(v)}</IDRegDocType>' for k, v in ID_REG_DOC_TYPES.items())
+    parts.append('</IDRegDocTypeValues><ListValues>')
+    parts.extend(f'<List ID="{k}">{v}</List>' for k, v in LIST_VALUES.items())
+    parts.append('</ListValues><LocPartTypeValues>')
+    parts.extend(f'<LocPartType ID="{k}">{escape(v)}</LocPartType>' for k, v in LOC_PART_TYPES.items())
+    parts.append('</LocPartTypeValues><NamePartTypeValues>')
+    parts.extend(f'<NamePartType ID="{k}">{v}</NamePartType>' for k, v in NAME_PART_TYPES.items())
+    parts.append('</NamePartTypeValues><PartySubTypeValues>')
+    parts.extend(f'<PartySubType ID="{k}" PartyTypeID="{t}">{v}</PartySubType>'
+                 for k, (v, t) in PARTY_SUB_TYPES.items())
+    parts.append('</PartySubTypeValues><PartyTypeValues>')
+    parts.extend(f'<PartyType ID="{k}">{v}</PartyType>' for k, v in PARTY_TYPES.items())
+    parts.append('</PartyTypeValues><SanctionsProgramValues>')
+    parts.extend(f'<SanctionsProgram ID="{k}">{v}</SanctionsProgram>' for k, v in SANCTIONS_PROGRAMS.items())
+    parts.append('</SanctionsProgramValues></ReferenceValueSets>')
+    return ''.join(parts)
+
+
+def _date_point(date):
+    year, month, day = date
+    return f'<Year>{year}</Year><Month>{month}</Month><Day>{day}</Day>'
+
+
+def _date_period(start, end):
+    return (
+        '<DatePeriod CalendarTypeID="1" YearFixed="false" MonthFixed="false" DayFixed="false">'
+        f'<Start Approximate="false"><From>{_date_point(start)}</From><To>{_date_point(start)}</To></Start>'
+        f'<End Approximate="false"><From>{_date_point(end)}</From><To>{_date_point(end)}</To></End>'
+        '</DatePeriod>'
+    )
+
+
+class _AdvancedXmlBuilder:
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.locations = []
+        self.id_reg_documents = []
+        self.parties = []
+        self.entries = []
+        self._next_id = 100000
+
+    def next_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def location(self, country_only=False):
+        rng = self.rng
+        location_id = self.next_id()
+        country_id = rng.choice(list(COUNTRIES))
+        parts = [f'<Location ID="{location_id}">']
+        if country_only:
+            country_name = COUNTRIES[country_id][1]
+            parts.append(self._location_part(1450, country_name))
+        else:
+            parts.append(f'<LocationCountry CountryID="{country_id}"/>')
+            parts.append(self._location_part(1451, f'{rng.randint(1, 999)} {_word(rng)} Street'))
+            if rng.random() < 0.3:
+                parts.append(self._location_part(1452, f'Building {rng.randint(1, 40)}'))
+            parts.append(self._location_part(1454, _word(rng)))
+            if rng.random() < 0.4:
+                parts.append(self._location_part(1455, _word(rng)))
+            if rng.random() < 0.5:
+                parts.append(self._location_part(1456, str(rng.randint(10000, 99999))))
+        parts.append('</Location>')
+        self.locations.append(''.join(parts))
+        return location_id
+
+    def _location_part(self, loc_part_type_id, value):
+        return (
+            f'<LocationPart LocPartTypeID="{loc_part_type_id}">'
+            '<LocationPartValue Primary="false"><Value>ignored</Value></LocationPartValue>'
+            f'<LocationPartValue Primary="true"><Comment/><Value>{escape(value)}</Value></LocationPartValue>'
+            '</LocationPart>'
+        )
+
+    def id_reg_document(self, identity_id):
+        rng = self.rng
+        doc_type = rng.choice(list(ID_REG_DOC_TYPES))
+        issued_by = f' IssuedBy-CountryID="{rng.choice(list(COUNTRIES))}"' if rng.random() < 0.7 else ''
+        self.id_reg_documents.append(
+            f'<IDRegDocument ID="{self.next_id()}" IDRegDocTypeID="{doc_type}" IdentityID="{identity_id}"{issued_by}>'
+            f'<Comment/><IDRegistrationNo>{rng.randint(10 ** 7, 10 ** 9)}</IDRegistrationNo>'
+            '</IDRegDocument>'
+        )
+
+    def feature(self, feature_type_id, body):
+        return (
+            f'<Feature ID="{self.next_id()}" FeatureTypeID="{feature_type_id}">'
+            f'<FeatureVersion ID="{self.next_id()}" ReliabilityID="1"><Comment/>{body}</FeatureVersion>'
+            '</Feature>'
+        )
+
+    def features(self, individual):
+        rng = self.rng
+        features = []
+        for _ in range(rng.randint(1, 3)):
+            features.append(self.feature(25, f'<VersionLocation LocationID="{self.location()}"/>'))
+        if individual:
+            year = rng.randint(1940, 2000)
+            if rng.random() < 0.5:
+                start = (year, rng.randint(1, 12), rng.randint(1, 28))
+                period = _date_period(start, start)
+            else:
+                period = _date_period((year, 1, 1), (year, 12, 31))
+            features.append(self.feature(8, f'{period}<VersionDetail DetailTypeID="1430"/>'))
+            features.append(self.feature(9, f'<VersionDetail DetailTypeID="1432">{_word(rng)}, {_word(rng)}</VersionDetail>'))
+            features.append(self.feature(10, '<VersionDetail DetailTypeID="1433"/>'
+                                             f'<VersionLocation LocationID="{self.location(country_only=True)}"/>'))
+            features.append(self.feature(224, f'<VersionDetail DetailTypeID="1431" DetailReferenceID="{rng.choice([91526, 91527])}"/>'))
+        else:
+            if rng.random() < 0.5:
+                features.append(self.feature(14, f'<VersionDetail DetailTypeID="1432">www.{_word(rng).lower()}.com</VersionDetail>'))
+            if rng.random() < 0.2:
+                features.append(self.feature(3, '<VersionDetail DetailTypeID="1433"/>'
+                                                f'<VersionLocation LocationID="{self.location(country_only=True)}"/>'))
+        return ''.join(features)
+
+    def alias(self, profile_id, alias_type_id, groups, individual):
+        rng = self.rng
+        values = []
+        if individual:
+            values.append((groups[1520], _word(rng, 4).upper()))
+            values.append((groups[1521], _word(rng)))
+        else:
+            values.append((groups[1525], f'{_word(rng, 4)} {_word(rng)} {rng.choice(["LLC", "LTD", "JSC"])}'.upper()))
+        parts = ''.join(
+            '<DocumentedNamePart>'
+            f'<NamePartValue NamePartGroupID="{group_id}" ScriptID="215" ScriptStatusID="1" Acronym="false">{escape(value)}</NamePartValue>'
+            '</DocumentedNamePart>'
+            for group_id, value in values
+        )
+        return (
+            f'<Alias FixedRef="{profile_id}" AliasTypeID="{alias_type_id}" Primary="true" LowQuality="false">'
+            f'<DocumentedName ID="{self.next_id()}" FixedRef="{profile_id}" DocNameStatusID="1">{parts}</DocumentedName>'
+            '</Alias>'
+        )
+
+    def party(self, profile_id):
+        rng = self.rng
+        individual = rng.random() < 0.4
+        identity_id = self.next_id()
+        name_part_types = [1520, 1521] if individual else [1525]
+        groups = {t: self.next_id() for t in name_part_types}
+        aliases = [self.alias(profile_id, 1403, groups, individual)]
+        for _ in range(rng.choice([0, 0, 1, 2, 4])):
+            aliases.append(self.alias(profile_id, rng.choice([1400, 1401]), groups, individual))
+        group_xml = ''.join(f'<NamePartGroup ID="{g}" NamePartTypeID="{t}"/>' for t, g in groups.items())
+        for _ in range(rng.choice([0, 1, 1, 2])):
+            self.id_reg_document(identity_id)
+        comment = f'<Comment>{escape(_word(rng))} remarks</Comment>' if rng.random() < 0.3 else '<Comment/>'
+        self.parties.append(
+            f'<DistinctParty FixedRef="{profile_id}">{comment}'
+            f'<Profile ID="{profile_id}" PartySubTypeID="{1 if individual else 4}">'
+            f'<Identity ID="{identity_id}" FixedRef="{profile_id}" Primary="true" False="false">'
+            f'{"".join(aliases)}<NamePartGroups><MasterNamePartGroup>{group_xml}</MasterNamePartGroup></NamePartGroups>'
+            '</Identity>'
+            f'{self.features(individual)}'
+            '</Profile></DistinctParty>'
+        )
+
+    def entry(self, profile_id, list_id):
+        rng = self.rng
+        measures = []
+        for program_id in rng.sample(list(SANCTIONS_PROGRAMS), rng.randint(1, 2)):
+            measures.append(
+                f'<SanctionsMeasure ID="{self.next_id()}" SanctionsTypeID="1">'
+                f'<Comment>{SANCTIONS_PROGRAMS[program_id]}</Comment><DatePeriod/></SanctionsMeasure>'
+            )
+        measures.append(f'<SanctionsMeasure ID="{self.next_id()}" SanctionsTypeID="3"><Comment>Block</Comment></SanctionsMeasure>')
+        self.entries.append(
+            f'<SanctionsEntry ID="{self.next_id()}" ProfileID="{profile_id}" ListID="{list_id}">'
+            f'<EntryEvent ID="{self.next_id()}" EntryEventTypeID="1" LegalBasisID="1"><Comment/></EntryEvent>'
+            f'{"".join(measures)}</SanctionsEntry>'
+        )
+
+
+def write_advanced_xml(out, entry_count, seed=0, list_ids=None):
+    """Writes a cons_advanced.xml lookalike with ``entry_count`` SanctionsEntries to a text stream."""
+    rng = random.Random(seed)
+    list_ids = list_ids or NON_SDN_LIST_IDS
+    builder = _AdvancedXmlBuilder(rng)
+    for i in range(entry_count):
+        profile_id = 1000 + i
+        builder.party(profile_id)
+        builder.entry(profile_id, rng.choice(list_ids))
+
+    out.write(f'<?xml version="1.0" encoding="utf-8"?>\n<Sanctions xmlns={quoteattr(ADVANCED_XML_NS)}>')
+    out.write('<DateOfIssue><Year>2024</Year><Month>1</Month><Day>1</Day></DateOfIssue>')
+    out.write(_reference_value_sets())
+    for section, items in (('Locations', builder.locations),
+                           ('IDRegDocuments', builder.id_reg_documents),
+                           ('DistinctParties', builder.parties)):
+        out.write(f'<{section}>')
+        out.writelines(items)
+        out.write(f'</{section}>')
+    out.write('<ProfileRelationships/><SanctionsEntries>')
+    out.writelines(builder.entries)
+    out.write('</SanctionsEntries></Sanctions>')
+
+
+SDN_XML_NS = 'https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/XML'
+
+SDN_COUNTRIES = [
+    'Afghanistan', 'Burma', 'China', 'Cuba', 'Iran', 'Korea, North', 'Lebanon', 'Russia',
+    'Syria', 'United Arab Emirates', 'Venezuela', 'Turkey', 'Germany', 'Panama', 'Cyprus'
+]
+SDN_PROGRAMS = ['SDGT', 'CUBA', 'IRAN', 'UKRAINE-EO13660', 'RUSSIA-EO14024', 'SDNTK', 'NPWMD']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def _sdn_entry(rng, uid):
+    individual = rng.random() < 0.45
+    vessel = not individual and rng.random() < 0.1
+    parts = [f'<sdnEntry><uid>{uid}</uid>']
+    if individual:
+        parts.append(f'<firstName>{_word(rng)}</firstName><lastName>{_word(rng, 4).upper()}</lastName>')
+        if rng.random() < 0.2:
+            parts.append(f'<title>{escape(_word(rng))} Minister</title>')
+        sdn_type = 'Individual'
+    else:
+        parts.append(f'<lastName>{_word(rng, 4).upper()} {_word(rng).upper()} {rng.choice(["LLC", "LTD", "JSC"])}</lastName>')
+        sdn_type = 'Vessel' if vessel else 'Entity'
+    parts.append(f'<sdnType>{sdn_type}</sdnType>')
+    if rng.random() < 0.4:
+        parts.append(f'<remarks>Linked To: {_word(rng, 4).upper()}.</remarks>')
+    parts.append('<programList>')
+    parts.extend(f'<program>{p}</program>' for p in rng.sample(SDN_PROGRAMS, rng.randint(1, 2)))
+    parts.append('</programList>')
+
+    if rng.random() < 0.6:
+        parts.append('<idList>')
+        for _ in range(rng.randint(1, 3)):
+            parts.append(
+                f'<id><uid>{rng.randint(1, 10 ** 6)}</uid><idType>{rng.choice(["Passport", "National ID No.", "Tax ID No."])}</idType>'
+                f'<idNumber>{rng.randint(10 ** 6, 10 ** 9)}</idNumber>'
+                + (f'<idCountry>{escape(rng.choice(SDN_COUNTRIES))}</idCountry>' if rng.random() < 0.7 else '')
+                + '</id>'
+            )
+        parts.append('</idList>')
+
+    if rng.random() < 0.7:
+        parts.append('<akaList>')
+        for _ in range(rng.randint(1, 4)):
+            first = f'<firstName>{_word(rng)}</firstName>' if individual else ''
+            parts.append(
+                f'<aka><uid>{rng.randint(1, 10 ** 6)}</uid><type>a.k.a.</type><category>strong</category>'
+                f'<lastName>{_word(rng, 4).upper()}</lastName>{first}</aka>'
+            )
+        parts.append('</akaList>')
+
+    parts.append('<addressList>')
+    for _ in range(rng.randint(1, 3)):
+        address = [f'<uid>{rng.randint(1, 10 ** 6)}</uid>']
+        if rng.random() < 0.7:
+            address.append(f'<address1>{rng.randint(1, 999)} {_word(rng)} Street</address1>')
+        if rng.random() < 0.2:
+            address.append(f'<address2>Floor {rng.randint(1, 30)}</address2>')
+        address.append(f'<city>{_word(rng)}</city>')
+        if rng.random() < 0.3:
+            address.append(f'<stateOrProvince>{_word(rng)}</stateOrProvince>')
+        if rng.random() < 0.4:
+            address.append(f'<postalCode>{rng.randint(10000, 99999)}</postalCode>')
+        address.append(f'<country>{escape(rng.choice(SDN_COUNTRIES))}</country>')
+        parts.append(f'<address>{"".join(address)}</address>')
+    parts.append('</addressList>')
+
+    if individual:
+        parts.append(f'<nationalityList><nationality><uid>{rng.randint(1, 10 ** 6)}</uid>'
+                     f'<country>{escape(rng.choice(SDN_COUNTRIES))}</country><mainEntry>true</mainEntry></nationality></nationalityList>')
+        if rng.random() < 0.5:
+            parts.append(f'<citizenshipList><citizenship><uid>{rng.randint(1, 10 ** 6)}</uid>'
+                         f'<country>{escape(rng.choice(SDN_COUNTRIES))}</country><mainEntry>true</mainEntry></citizenship></citizenshipList>')
+        parts.append(f'<dateOfBirthList><dateOfBirthItem><uid>{rng.randint(1, 10 ** 6)}</uid>'
+                     f'<dateOfBirth>{rng.randint(1, 28):02d} {rng.choice(MONTHS)} {rng.randint(1940, 2000)}</dateOfBirth>'
+                     '<mainEntry>true</mainEntry></dateOfBirthItem></dateOfBirthList>')
+        parts.append(f'<placeOfBirthList><placeOfBirthItem><uid>{rng.randint(1, 10 ** 6)}</uid>'
+                     f'<placeOfBirth>{_word(rng)}, {escape(rng.choice(SDN_COUNTRIES))}</placeOfBirth>'
+                     '<mainEntry>true</mainEntry></placeOfBirthItem></placeOfBirthList>')
+
+    if vessel:
+        parts.append(f'<vesselInfo><callSign>{_word(rng).upper()}</callSign><vesselType>Crude Oil Tanker</vesselType>'
+                     f'<vesselFlag>{escape(rng.choice(SDN_COUNTRIES))}</vesselFlag><tonnage>{rng.randint(1000, 90000)}</tonnage>'
+                     f'<grossRegisteredTonnage>{rng.randint(1000, 90000)}</grossRegisteredTonnage></vesselInfo>')
+    parts.append('</sdnEntry>')
+    return ''.join(parts)
+
+
+def write_sdn_xml(out, entry_count, seed=0):
+    """Writes an sdn.xml lookalike with ``entry_count`` sdnEntry elements to a text stream."""
+    rng = random.Random(seed)
+    out.write(f'<?xml version="1.0" standalone="yes"?>\n<sdnList xmlns={quoteattr(SDN_XML_NS)}>')
+    out.write(f'<publshInformation><Publish_Date>01/01/2024</Publish_Date><Record_Count>{entry_count}</Record_Count></publshInformation>')
+    for i in range(entry_count):
+        out.write(_sdn_entry(rng, 10000 + i))
+    out.write('</sdnList>')
+
+# Country spellings as they appear in the address, ID, nationality and
+# citizenship fields of sdn.xml.
+SDN_COUNTRY_VOCABULARY = [
+    'Afghanistan', 'Albania', 'Algeria', 'Angola', 'Argentina', 'Armenia', 'Aruba',
+    'Australia', 'Austria', 'Azerbaijan', 'Bahamas, The', 'Bahrain', 'Bangladesh',
+    'Barbados', 'Belarus', 'Belgium', 'Belize', 'Benin', 'Bolivia', 'Bosnia and Herzegovina',
+    'Botswana', 'Brazil', 'British Virgin Islands', 'Brunei', 'Bulgaria', 'Burkina Faso',
+    'Burma', 'Burundi', 'Cabo Verde', 'Cambodia', 'Cameroon', 'Canada', 'Cayman Islands',
+    'Central African Republic', 'Chad', 'Chile', 'China', 'Colombia', 'Comoros',
+    'Congo, Democratic Republic of the', 'Congo, Republic of the', 'Costa Rica',
+    'Cote d Ivoire', 'Croatia', 'Cuba', 'Curacao', 'Cyprus', 'Czech Republic', 'Denmark',
+    'Djibouti', 'Dominica', 'Dominican Republic', 'Ecuador', 'Egypt', 'El Salvador',
+    'Equatorial Guinea', 'Eritrea', 'Estonia', 'Ethiopia', 'Finland', 'France', 'Gabon',
+    'Georgia', 'Germany', 'Ghana', 'Gibraltar', 'Greece', 'Guatemala', 'Guernsey', 'Guinea',
+    'Guinea-Bissau', 'Guyana', 'Haiti', 'Honduras', 'Hong Kong', 'Hungary', 'India',
+    'Indonesia', 'Iran', 'Iraq', 'Ireland', 'Isle of Man', 'Israel', 'Italy', 'Jamaica',
+    'Japan', 'Jersey', 'Jordan', 'Kazakhstan', 'Kenya', 'Korea, North', 'Korea, South',
+    'Kosovo', 'Kuwait', 'Kyrgyzstan', 'Laos', 'Latvia', 'Lebanon', 'Liberia', 'Libya',
+    'Liechtenstein', 'Lithuania', 'Luxembourg', 'Macau', 'Malaysia', 'Maldives', 'Mali',
+    'Malta', 'Marshall Islands', 'Mauritania', 'Mauritius', 'Mexico', 'Moldova', 'Monaco',
+    'Mongolia', 'Montenegro', 'Morocco', 'Mozambique', 'Namibia', 'Nepal', 'Netherlands',
+    'Netherlands Antilles', 'New Zealand', 'Nicaragua', 'Niger', 'Nigeria',
+    'North Macedonia, The Republic of', 'Norway', 'Oman', 'Pakistan', 'Palau', 'Palestinian',
+    'Panama', 'Paraguay', 'Peru', 'Philippines', 'Poland', 'Portugal', 'Qatar',
+    'Region: Crimea', 'Region: Gaza', 'Romania', 'Russia', 'Rwanda',
+    'Saint Kitts and Nevis', 'Saint Vincent and the Grenadines', 'Samoa', 'Saudi Arabia',
+    'Senegal', 'Serbia', 'Seychelles', 'Sierra Leone', 'Singapore', 'Slovakia', 'Slovenia',
+    'Somalia', 'South Africa', 'South Sudan', 'Spain', 'Sri Lanka', 'Sudan', 'Suriname',
+    'Sweden', 'Switzerland', 'Syria', 'Taiwan', 'Tajikistan', 'Tanzania', 'Thailand',
+    'The Gambia', 'Togo', 'Trinidad and Tobago', 'Tunisia', 'Turkey', 'Turkmenistan',
+    'Uganda', 'Ukraine', 'United Arab Emirates', 'United Kingdom', 'United States',
+    'Uruguay', 'Uzbekistan', 'Vanuatu', 'Venezuela', 'Vietnam', 'Virgin Islands, British',
+    'West Bank', 'Yemen', 'Zambia', 'Zimbabwe', 'undetermined'
+]
+
+
+BIS_HEADERS = [
+    'Source List', 'Entity Number', 'SDN Type', 'Programs', 'Name', 'Title', 'Address', 'City',
+    'State/Province', 'Postal Code', 'Country', 'Federal Register Notice', 'Effective Date',
+    'Date Lifted/Waived/Expired', 'Standard Order', 'License Requirement', 'License Policy',
+    'Call Sign', 'Vessel Type', 'Gross Tonnage', 'Gross Register Tonnage', 'Vessel Flag',
+    'Vessel Owner', 'Remarks/Notes', 'Address Number', 'Address Remarks', 'Alternate Number',
+    'Alternate Type', 'Alternate Name', 'Alternate Remarks', 'Web Link'
+]
+DPL_HEADERS = [
+    'Name', 'Street_Address', 'City', 'State', 'Country', 'Postal_Code', 'Effective_Date',
+    'Expiration_Date', 'Standard_Order', 'Last_Update', 'Action', 'FR_Citation'
+]
+ISN_HEADERS = [
+    'Source List', 'Programs', 'Name', 'Alternative Names', 'Country',
+    'Federal Register Notice', 'Effective Date', 'Remarks/Notes', 'Web Link'
+]
+UVL_HEADERS = ['COUNTRY', 'NAME', 'ADDRESS']
+DTC_STAT_HEADERS = ['Party Name', 'Date Of Birth', 'Federal Register Notice', 'Notice Date', 'Corrected Notice', 'Corrected Notice Date']
+DTC_ADMIN_HEADERS = ['Name', 'Date', 'Charging Letter', 'Debarment Order', 'Federal Register Notice']
+ISN_PROGRAMS = ['INKSNA', 'EO 13382', 'CBW Act', 'Missile Sanctions', 'Executive Order 12938']
+CSV_COUNTRIES = ['China', 'Russia', 'Iran', 'Pakistan', 'United Arab Emirates', 'Hong Kong', 'Burma', 'Turkey']
+
+
+def _csv_name(rng):
+    return f'{_word(rng, 4)} {_word(rng)} {rng.choice(["Co., Ltd.", "LLC", "Trading", "Société Générale"])}'
+
+
+def _american_date(rng):
+    return f'{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(1995, 2024)}'
+
+
+def _fr_notice(rng):
+    return f'{rng.randint(60, 89)} FR {rng.randint(1000, 99999)}'
+
+
+def _csv_parties(rng, entry_count):
+    # About a fifth of the rows repeat an earlier name and notice with another address,
+    # the way the BIS and State files list each address of a party on its own row.
+    parties = []
+    for _ in range(entry_count):
+        if parties and rng.random() < 0.2:
+            parties.append(rng.choice(parties[-50:]))
+        else:
+            parties.append((_csv_name(rng), _fr_notice(rng), _american_date(rng)))
+    return parties
+
+
+def _address(rng):
+    return {
+        'address': f'{rng.randint(1, 999)} {_word(rng)} Road',
+        'city': _word(rng),
+        'state': _word(rng) if rng.random() < 0.3 else '',
+        'postal_code': str(rng.randint(10000, 99999)) if rng.random() < 0.6 else '',
+        'country': rng.choice(CSV_COUNTRIES)
+    }
+
+
+def write_bis_csv(out, entry_count, seed=0, source_list='Entity List (EL) - Bureau of Industry and Security'):
+    """Writes an Entity List or Military End User CSV lookalike with ``entry_count`` rows to a text stream."""
+    rng = random.Random(seed)
+    writer = csv.DictWriter(out, BIS_HEADERS)
+    writer.writeheader()
+    for name, notice, date in _csv_parties(rng, entry_count):
+        address = _address(rng)
+        writer.writerow({
+            'Source List': source_list, 'Name': name, 'Address': address['address'],
+            'City': address['city'], 'State/Province': address['state'],
+            'Postal Code': address['postal_code'], 'Country': address['country'],
+            'Federal Register Notice': notice, 'Effective Date': date, 'Standard Order': 'N',
+            'License Requirement': 'For all items subject to the EAR.',
+            'License Policy': 'Presumption of denial.',
+            'Alternate Name': f'{_csv_name(rng)}; and {_csv_name(rng)}' if rng.random() < 0.3 else '',
+            'Remarks/Notes': f'Linked to {_word(rng)}' if rng.random() < 0.2 else ''
+        })
+
+
+def write_dpl_txt(out, entry_count, seed=0):
+    """Writes a tab separated dpl.txt lookalike with ``entry_count`` rows to a text stream."""
+    rng = random.Random(seed)
+    writer = csv.DictWriter(out, DPL_HEADERS, delimiter='\t')
+    writer.writeheader()
+    for name, notice, date in _csv_parties(rng, entry_count):
+        address = _address(rng)
+        writer.writerow({
+            'Name': name, 'Street_Address': address['address'], 'City': address['city'],
+            'State': address['state'], 'Country': address['country'][:2].upper(),
+            'Postal_Code': address['postal_code'], 'Effective_Date': date,
+            'Expiration_Date': _american_date(rng) if rng.random() < 0.5 else '',
+            'Standard_Order': 'Y', 'Last_Update': date, 'Action': 'FR NOTICE ADDED', 'FR_Citation': notice
+        })
+
+
+def write_isn_csv(out, entry_count, seed=0):
+    """Writes a Nonproliferation Sanctions CSV lookalike with ``entry_count`` rows to a text stream."""
+    rng = random.Random(seed)
+    writer = csv.DictWriter(out, ISN_HEADERS)
+    writer.writeheader()
+    for name, notice, date in _csv_parties(rng, entry_count):
+        writer.writerow({
+            'Source List': 'Nonproliferation Sanctions (ISN) - State Department',
+            'Programs': rng.choice(ISN_PROGRAMS), 'Name': name,
+            'Alternative Names': f'{_csv_name(rng)}, and {_csv_name(rng)}' if rng.random() < 0.3 else '',
+            'Country': rng.choice(CSV_COUNTRIES), 'Federal Register Notice': notice, 'Effective Date': date,
+            'Remarks/Notes': 'Sanctions waived.' if rng.random() < 0.1 else ''
+        })
+
+
+def write_uvl_csv(out, entry_count, seed=0):
+    """Writes an Unverified List CSV lookalike with ``entry_count`` rows to a text stream."""
+    rng = random.Random(seed)
+    writer = csv.DictWriter(out, UVL_HEADERS)
+    writer.writeheader()
+    for name, _, _ in _csv_parties(rng, entry_count):
+        address = _address(rng)
+        writer.writerow({
+            'COUNTRY': address['country'], 'NAME': name,
+            'ADDRESS': f"{address['address']}, {address['city']}"
+        })
+
+
+def write_dtc_stat_csv(out, entry_count, seed=0):
+    """Writes a statutorily debarred parties CSV lookalike with ``entry_count`` rows to a text stream."""
+    rng = random.Random(seed)
+    writer = csv.DictWriter(out, DTC_STAT_HEADERS)
+    writer.writeheader()
+    for _ in range(entry_count):
+        name = f'{_word(rng, 4)}, {_word(rng)}'
+        if rng.random() < 0.2:
+            name = f'{name} (a.k.a. {_word(rng)} {_word(rng, 4)})'
+        corrected = rng.random() < 0.1
+        writer.writerow({
+            'Party Name': name, 'Date Of Birth': _american_date(rng),
+            'Federal Register Notice': _fr_notice(rng), 'Notice Date': _american_date(rng),
+            'Corrected Notice': _fr_notice(rng) if corrected else '',
+            'Corrected Notice Date': _american_date(rng) if corrected else ''
+        })
+
+
+def write_dtc_admin_csv(out, entry_count, seed=0):
+    """Writes an administratively debarred parties CSV lookalike with ``entry_count`` rows to a text stream."""
+    rng = random.Random(seed)
+    writer = csv.DictWriter(out, DTC_ADMIN_HEADERS)
+    writer.writeheader()
+    for _ in range(entry_count):
+        writer.writerow({
+            'Name': _csv_name(rng), 'Date': _american_date(rng), 'Charging Letter': 'Yes',
+            'Debarment Order': 'Yes', 'Federal Register Notice': _fr_notice(rng)
+        })
@@ -0,0 +1,189 @@
+"""Runs every importer end to end on synthetic sources and compares with a baseline.
+
+    python -m benchmarks.importers
+    python -m benchmarks.importers --sizes 1000,10000,50000 --importers sdn,nonsdn
+    python -m benchmarks.importers --save-baseline
+
+Each ``*_data.main`` and the Non-SDN ``treasury_importer`` run is timed in its
+own child process. Sources are served by an in-process HTTP stand-in, and the
+outputs go to a stub blob store that only counts bytes. Wall time, peak RSS and
+throughput are reported per importer and size, next to the change from
+benchmarks/baseline.json. Run with --save-baseline on the reference machine after
+an intended change to update it.
+"""
+import argparse
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import tempfile
+import time
+
+from . import fixtures, stubs
+from .app import import_app_module
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+IMPORTERS = {
+    'dpl': {
+        'module': 'DplDataTimer.dpl_data',
+        'sources': [('https://www.bis.doc.gov/dpl/dpl.txt', 'dpl.txt', fixtures.write_dpl_txt, 'utf-8', {})]
+    },
+    'el': {
+        'module': 'ElDataTimer.el_data',
+        'sources': [('https://www.bis.doc.gov/index.php/documents/consolidated-entity-list/1072-el-2/file',
+                     'el.csv', fixtures.write_bis_csv, 'utf-8-sig', {})]
+    },
+    'isn': {
+        'module': 'IsnDataTimer.isn_data',
+        'sources': [('https://csldata.blob.core.windows.net/csltempdata/sanctions.csv',
+                     'isn.csv', fixtures.write_isn_csv, 'utf-8', {})]
+    },
+    'meu': {
+        'module': 'MeuDataTimer.meu_data',
+        'sources': [('https://www.bis.doc.gov/index.php/documents/consolidated-entity-list/2884-meu/file', 'meu.csv',
+                     functools.partial(fixtures.write_bis_csv, source_list='Military End User (MEU) List'), 'ISO-8859-1', {})]
+    },
+    'uvl': {
+        'module': 'UvlDataTimer.uvl_data',
+        'sources': [('https://www.bis.doc.gov/index.php/component/docman/?task=doc_download&gid=1053',
+                     'uvl.csv', fixtures.write_uvl_csv, 'utf-8-sig', {})]
+    },
+    'dtc': {
+        'module': 'DtcDataTimer.dtc_data',
+        'sources': [
+            ('https://www.pmddtc.state.gov/sys_attachment.do?sys_id=91c00215478f06d07ddc0c03e16d43e0', 'dtc_stat.csv',
+             lambda out, entries, seed: fixtures.write_dtc_stat_csv(out, entries // 2, seed), 'utf-8-sig',
+             {'Content-Disposition': 'attachment; filename="ITAR_Debarred_Parties_20240101.csv"'}),
+            ('https://www.pmddtc.state.gov/sys_attachment.do?sys_id=d78bbc2f1b8f29d0c6c3866ae54bcbd7', 'dtc_admin.csv',
+             lambda out, entries, seed: fixtures.write_dtc_admin_csv(out, entries - entries // 2, seed), 'utf-8',
+             {'Content-Disposition': 'attachment; filename="Administrative_Debarments_1.1.24.csv"'})
+        ]
+    },
+    'sdn': {
+        'module': 'SdnDataTimer.sdn_data',
+        'sources': [('https://www.treasury.gov/ofac/downloads/sdn.xml', 'sdn.xml', fixtures.write_sdn_xml, 'utf-8', {})]
+    },
+    'nonsdn': {
+        'module': 'shared.treasury_importer',
+        'function': 'run_consolidated_import',
+        'sources': [('https://sanctionslistservice.ofac.treas.gov/api/publicationpreview/exports/cons_advanced.xml',
+                     'cons_advanced.xml', fixtures.write_advanced_xml, 'utf-8', {})]
+    }
+}
+
+
+def write_fixtures(directory, importer_names, entries, seed):
+    for name in importer_names:
+        for _, filename, write, encoding, _ in IMPORTERS[name]['sources']:
+            with open(os.path.join(directory, filename), 'w', encoding=encoding, newline='') as f:
+                write(f, entries, seed)
+
+
+def run_importer(name, directory, conn):
+    # Missing meta files are logged as errors on every first import.
+    logging.disable(logging.ERROR)
+    importer = IMPORTERS[name]
+    storage = import_app_module('shared.storage')
+    blob_service_client = stubs.StubBlobServiceClient()
+    stubs.install(storage, blob_service_client, {
+        url: (os.path.join(directory, filename), headers)
+        for url, filename, _, _, headers in importer['sources']
+    })
+    module = import_app_module(importer['module'])
+
+    start = time.perf_counter()
+    getattr(module, importer.get('function', 'main'))()
+    elapsed = time.perf_counter() - start
+
+    conn.send({
+        'wall_s': elapsed,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'entities': blob_service_client.entity_count(),
+        'source_mb': sum(os.path.getsize(os.path.join(directory, source[1])) for source in importer['sources']) / 1e6,
+        'output_mb': blob_service_client.output_size() / 1e6
+    })
+
+
+def measure(name, directory, repeat):
+    results = []
+    for _ in range(repeat):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=run_importer, args=(name, directory, sender))
+        process.start()
+        sender.close()
+        try:
+            result = receiver.recv()
+        except EOFError:
+            raise RuntimeError(f'{name} failed, see the traceback above')
+        finally:
+            process.join()
+        results.append(result)
+    best = min(results, key=lambda result: result['wall_s'])
+    best['peak_rss_mb'] = max(result['peak_rss_mb'] for result in results)
+    best['entities_per_s'] = best['entities'] / best['wall_s']
+    best['source_mb_per_s'] = best['source_mb'] / best['wall_s']
+    return best
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)['results']
+    except FileNotFoundError:
+        return {}
+
+
+def change(value, baseline_value):
+    if not baseline_value:
+        return '-'
+    return f'{(value - baseline_value) / baseline_value:+.0%}'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--importers', default=','.join(IMPORTERS))
+    parser.add_argument('--sizes', default='1000,10000')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    importer_names = args.importers.split(',')
+    sizes = [int(size) for size in args.sizes.split(',')]
+    baseline = load_baseline(args.baseline)
+    results = {}
+    print(f'{"importer":<8} {"entries":>7} {"entities":>8} {"source MB":>9} {"wall s":>7} {"RSS MB":>7} '
+          f'{"entities/s":>10} {"MB/s":>6} {"wall vs base":>12} {"RSS vs base":>11}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            directory = os.path.join(tmp, str(size))
+            os.mkdir(directory)
+            # Written in a child process so the generators do not add to the importers' RSS.
+            writer = multiprocessing.Process(target=write_fixtures, args=(directory, importer_names, size, args.seed))
+            writer.start()
+            writer.join()
+            for name in importer_names:
+                key = f'{name}/{size}'
+                result = results[key] = measure(name, directory, args.repeat)
+                base = baseline.get(key, {})
+                print(f'{name:<8} {size:>7} {result["entities"]:>8} {result["source_mb"]:>9.2f} {result["wall_s"]:>7.2f} '
+                      f'{result["peak_rss_mb"]:>7.0f} {result["entities_per_s"]:>10.0f} {result["source_mb_per_s"]:>6.1f} '
+                      f'{change(result["wall_s"], base.get("wall_s")):>12} {change(result["peak_rss_mb"], base.get("peak_rss_mb")):>11}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'machine': f'{platform.machine()} {os.cpu_count()} CPUs, Python {platform.python_version()}',
+                'seed': args.seed,
+                'results': {key: {k: round(v, 4) for k, v in result.items()} for key, result in results.items()}
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Reports the cold-start import cost of each timer function.
+
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --repeat 5
+
+Every function folder is imported in a fresh interpreter with
+``python -X importtime``, the way the Functions host imports it, and the
+best cumulative time over --repeat runs is reported together with the
+heaviest modules it pulled in.
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+from .app import APP_ROOT
+
+IMPORT_SCRIPT = '''
+import time
+from benchmarks.app import import_app_module
+start = time.perf_counter()
+import_app_module({!r})
+print(time.perf_counter() - start)
+'''
+WATCHED_MODULES = ('pycountry', 'chardet', 'azure.storage.blob')
+
+
+def get_timer_folders():
+    paths = glob.glob(os.path.join(APP_ROOT, '*DataTimer', '__init__.py'))
+    return sorted(os.path.basename(os.path.dirname(path)) for path in paths)
+
+
+def import_times(folder):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_SCRIPT.format(folder)],
+        cwd=APP_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000
+    return float(result.stdout) * 1000, times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"function":<20} {"import ms":>10}  {"loads":<30} heaviest')
+    for folder in get_timer_folders():
+        total, best = min(import_times(folder) for _ in range(args.repeat))
+        loaded = [name for name in WATCHED_MODULES if name in best]
+        heaviest = sorted(
+            (name for name in best if name.count('.') <= 2 and not name.startswith(('__app__', 'benchmarks'))),
+            key=best.get, reverse=True
+        )[:args.top]
+        heaviest = ', '.join(f'{name} {best[name]:.0f}' for name in heaviest)
+        print(f'{folder:<20} {total:>10.1f}  {", ".join(loaded) or "-":<30} {heaviest}')
+
+
+if __name__ == '__main__':
+    main()
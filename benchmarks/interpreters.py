@@ -0,0 +1,52 @@
+"""Runs the importers end to end under each supported Python version.
+
+    python -m benchmarks.interpreters
+    python -m benchmarks.interpreters --pythons /path/to/venv39/bin/python,python3.10
+
+Each interpreter runs benchmarks.importers once at a small size, so every
+importer reads, decodes and writes a changed source. The interpreters need the
+packages from requirements.txt installed. Interpreters that cannot be found are
+skipped, and the exit status is 1 when an importer fails under any of the others.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PYTHONS = ['python3.9', 'python3.10', sys.executable]
+
+
+def run_importers(python, size):
+    process = subprocess.run(
+        [python, '-m', 'benchmarks.importers', '--sizes', str(size)],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return process.returncode, process.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pythons', default=','.join(DEFAULT_PYTHONS))
+    parser.add_argument('--size', type=int, default=200)
+    args = parser.parse_args()
+
+    failed = False
+    for python in args.pythons.split(','):
+        if shutil.which(python) is None:
+            print(f'{python}: not found, skipped')
+            continue
+        version = subprocess.run([python, '--version'], stdout=subprocess.PIPE, text=True).stdout.strip()
+        returncode, output = run_importers(python, args.size)
+        if returncode == 0:
+            print(f'{python} ({version}): ok')
+        else:
+            failed = True
+            print(f'{python} ({version}): failed')
+            print(output)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Checks that each profile's name part groups are scanned once per extraction.
+
+    python -m benchmarks.name_part_scans --entries 5000
+
+The NamePartGroups lookup in xpath_finder is counted per profile while both
+engines extract a synthetic cons_advanced.xml. Every alias of a profile shares
+the same groups, so more than one scan of a profile means the lookup went back
+into the alias loop. The exit status is 1 when any profile was scanned again.
+"""
+import argparse
+import collections
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from sanctions_list_parser import xpath_finder as finder
+
+from .treasury_extract import ENGINES, write_fixture
+
+
+def count_scans(engine, path):
+    scans = collections.Counter()
+    find_name_part_groups = finder.find_name_part_groups
+
+    def counted_find_name_part_groups(profile):
+        scans[profile.attrib['ID']] += 1
+        return find_name_part_groups(profile)
+
+    finder.find_name_part_groups = counted_find_name_part_groups
+    try:
+        ENGINES[engine](path)
+    finally:
+        finder.find_name_part_groups = find_name_part_groups
+    return scans
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rescanned = False
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cons_advanced.xml')
+        writer = multiprocessing.Process(target=write_fixture, args=(path, args.entries, args.seed))
+        writer.start()
+        writer.join()
+
+        for engine in sorted(ENGINES):
+            scans = count_scans(engine, path)
+            most = max(scans.values(), default=0)
+            rescanned = rescanned or most > 1
+            print(f'{engine}: {sum(scans.values())} scans over {len(scans)} profiles, at most {most} per profile')
+    sys.exit(1 if rescanned else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Counts ElementPath queries and path compiles during a full Treasury extraction.
+
+    python -m benchmarks.path_compile --entries 5000 --engine streaming
+    python -m benchmarks.path_compile --entries 5000 --engine dom
+
+ElementTree compiles every distinct path string once and keeps at most 100 of
+them, so paths with attribute values formatted in keep being compiled again.
+The ElementPath module is instrumented to count the queries that reach it, the
+cache misses that compile a path, and the time spent in those compiling calls.
+Queries by plain tag are answered by the C element without reaching ElementPath.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from xml.etree import ElementPath
+
+from .treasury_extract import ENGINES, write_fixture
+
+
+class PathCompileCounter:
+
+    def __init__(self):
+        self.queries = 0
+        self.compiles = 0
+        self.compile_seconds = 0.0
+        self.paths = set()
+
+    def install(self):
+        iterfind = ElementPath.iterfind
+        xpath_tokenizer = ElementPath.xpath_tokenizer
+
+        def counted_xpath_tokenizer(*args, **kwargs):
+            self.compiles += 1
+            return xpath_tokenizer(*args, **kwargs)
+
+        def counted_iterfind(elem, path, namespaces=None):
+            self.queries += 1
+            self.paths.add(path)
+            compiles = self.compiles
+            start = time.perf_counter()
+            result = iterfind(elem, path, namespaces)
+            if self.compiles != compiles:
+                self.compile_seconds += time.perf_counter() - start
+            return result
+
+        ElementPath.xpath_tokenizer = counted_xpath_tokenizer
+        ElementPath.iterfind = counted_iterfind
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='streaming')
+    args = parser.parse_args()
+
+    counter = PathCompileCounter()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cons_advanced.xml')
+        writer = multiprocessing.Process(target=write_fixture, args=(path, args.entries, args.seed))
+        writer.start()
+        writer.join()
+
+        counter.install()
+        start = time.perf_counter()
+        count = ENGINES[args.engine](path)
+        elapsed = time.perf_counter() - start
+
+    print(f'{args.engine}: extracted {count} entries in {elapsed:.2f}s')
+    print(f'ElementPath queries: {counter.queries} over {len(counter.paths)} distinct paths')
+    print(f'path compiles: {counter.compiles} taking {counter.compile_seconds * 1000:.0f} ms '
+          f'({counter.compile_seconds / elapsed:.1%} of the extraction)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Compares the memory held by the Treasury reference dictionaries.
+
+    python -m benchmarks.reference_memory --repeat 20
+
+The reference value sets are generated at about the sizes of the published
+cons_advanced.xml. The current tuple records, with both country directions
+built in one pass, are compared against the previous layout of one dict per
+reference value and a second full pass for the reverse country map. Memory is
+what tracemalloc sees allocated by each build while its result is kept alive.
+"""
+import argparse
+import time
+import tracemalloc
+import xml.etree.ElementTree as ElementTree
+
+from sanctions_list_parser import reference_dict_builder
+from sanctions_list_parser import xpath_finder as finder
+
+from . import fixtures
+
+# Approximate number of values per set in the published file.
+REAL_SET_SIZES = {
+    'AliasType': 4,
+    'Country': 290,
+    'DetailReference': 1700,
+    'DetailType': 4,
+    'FeatureType': 160,
+    'IDRegDocType': 120,
+    'List': 40,
+    'LocPartType': 12,
+    'NamePartType': 8,
+    'PartySubType': 12,
+    'PartyType': 6,
+    'SanctionsProgram': 110
+}
+
+
+def reference_value_sets_xml():
+    parts = [f'<ReferenceValueSets xmlns="{fixtures.ADVANCED_XML_NS}">']
+    next_id = 1
+    for name, size in REAL_SET_SIZES.items():
+        parts.append(f'<{name}Values>')
+        for i in range(size):
+            attributes = f'ID="{next_id}"'
+            if name == 'Country':
+                attributes += f' ISO2="{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}"'
+            elif name == 'PartySubType':
+                attributes += f' PartyTypeID="{i % REAL_SET_SIZES["PartyType"] + 1}"'
+            parts.append(f'<{name} {attributes}>{name} value {i}</{name}>')
+            next_id += 1
+        parts.append(f'</{name}Values>')
+    parts.append('</ReferenceValueSets>')
+    return ''.join(parts)
+
+
+def build_dict_layout(reference_value_sets):
+    # The layout before the tuple records, kept here for comparison.
+    def build(element_name, key_field_name='id'):
+        entries = {}
+        for e in finder.find_all_reference_values(reference_value_sets, element_name):
+            entry = {'id': int(e.attrib['ID']), 'value': e.text.strip()}
+            if element_name == 'Country':
+                entry['iso2'] = e.attrib.get('ISO2')
+            elif element_name == 'PartySubType':
+                entry['party_type_id'] = int(e.attrib['PartyTypeID'])
+            entries[entry[key_field_name]] = entry
+        return entries
+
+    reference_dict = {name: build(name) for name in REAL_SET_SIZES}
+    reference_dict['ReverseCountry'] = build('Country', 'value')
+    return reference_dict
+
+
+LAYOUTS = {
+    'dicts': build_dict_layout,
+    'records': reference_dict_builder.build_from_reference_value_sets
+}
+
+
+def measure(build, reference_value_sets, repeat):
+    tracemalloc.start()
+    reference_dict = build(reference_value_sets)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del reference_dict
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build(reference_value_sets)
+    return allocated, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    reference_value_sets = ElementTree.fromstring(reference_value_sets_xml())
+    print(f'{sum(REAL_SET_SIZES.values())} reference values')
+    print(f'{"layout":<8} {"KiB":>8} {"build ms":>9}')
+    for name, build in LAYOUTS.items():
+        allocated, seconds = measure(build, reference_value_sets, args.repeat)
+        print(f'{name:<8} {allocated / 1024:>8.1f} {seconds * 1000:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
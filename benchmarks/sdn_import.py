@@ -0,0 +1,56 @@
+"""Times the SDN importer's parse and write stage on a synthetic sdn.xml.
+
+    python -m benchmarks.sdn_import --entries 12000
+    python -m benchmarks.sdn_import --entries 48000
+
+Outputs go through the shared output pipeline into local sinks in a temporary
+directory, and nothing is uploaded. The fixture is written in a child process so the reported peak RSS
+only covers parsing and writing; it should stay flat as --entries grows.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from . import fixtures
+from .app import import_app_module
+
+
+def write_fixture(path, entries, seed):
+    with open(path, 'w', encoding='utf-8') as f:
+        fixtures.write_sdn_xml(f, entries, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=12000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sdn_data = import_app_module('SdnDataTimer.sdn_data')
+    output = import_app_module('shared.output')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sdn.xml')
+        writer = multiprocessing.Process(target=write_fixture, args=(path, args.entries, args.seed))
+        writer.start()
+        writer.join()
+        size_mb = os.path.getsize(path) / 1e6
+
+        out_dir = os.path.join(tmp, 'out')
+        os.mkdir(out_dir)
+        start = time.perf_counter()
+        with open(path, 'rb') as source:
+            count = output.write_outputs(output.OutputWriter('sdn', output.local_sinks(out_dir)), sdn_data.iter_outputs(source))
+        elapsed = time.perf_counter() - start
+        output_mb = sum(os.path.getsize(os.path.join(out_dir, f'sdn.{ext}')) for ext in ['csv', 'tsv', 'json']) / 1e6
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'sdn: {args.entries} entries, {size_mb:.1f} MB')
+    print(f'wrote {count} entries ({output_mb:.1f} MB) in {elapsed:.2f}s ({count / elapsed:.0f} entries/s)')
+    print(f'peak RSS: {peak_rss_mb:.0f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""In-process stand-ins for Azure Blob Storage and the source web servers.
+
+The importers only see their usual ``storage.get_blob_service_client()`` and
+``urllib.request.urlopen`` calls, so the whole ``main`` runs without network
+access. Uploaded data is counted and dropped, so it does not add to the RSS
+being measured.
+"""
+import email.message
+import io
+import urllib.request
+import urllib.response
+
+from azure.core.exceptions import ResourceNotFoundError
+
+LAST_MODIFIED = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+
+class StubBlobClient:
+
+    def __init__(self, service, container, blob):
+        self.service = service
+        self.container = container
+        self.blob_name = blob
+        self.staged_sizes = {}
+
+    def stage_block(self, block_id, data, **kwargs):
+        self.staged_sizes[block_id] = len(data)
+
+    def commit_block_list(self, block_list, content_settings=None, metadata=None, **kwargs):
+        size = sum(self.staged_sizes.pop(block.id) for block in block_list)
+        return self.service.commit(self.container, self.blob_name, size, metadata)
+
+    def upload_blob(self, data, overwrite=False, content_settings=None, metadata=None, **kwargs):
+        return self.service.commit(self.container, self.blob_name, len(data), metadata)
+
+    def download_blob(self, *args, **kwargs):
+        # Every run is a first import, so there are no previous entity hashes.
+        raise ResourceNotFoundError(f'{self.container}/{self.blob_name} is not stored by the benchmark')
+
+    def set_blob_metadata(self, metadata=None, **kwargs):
+        self.service.blobs[(self.container, self.blob_name)]['metadata'] = metadata or {}
+
+
+class StubBlobServiceClient:
+
+    def __init__(self):
+        self.blobs = {}
+
+    def get_blob_client(self, container, blob):
+        return StubBlobClient(self, container, blob)
+
+    def commit(self, container, blob_name, size, metadata):
+        etag = f'"{len(self.blobs)}"'
+        self.blobs[(container, blob_name)] = {'size': size, 'metadata': metadata or {}}
+        return {'etag': etag}
+
+    def output_size(self):
+        return sum(blob['size'] for blob in self.blobs.values())
+
+    def entity_count(self):
+        return sum(
+            int(blob['metadata'].get('entity_count', 0))
+            for (_, blob_name), blob in self.blobs.items()
+            if blob_name.endswith('.json')
+        )
+
+
+class StandInHandler(urllib.request.BaseHandler):
+    # Ahead of the default HTTP and HTTPS handlers.
+    handler_order = 100
+
+    def __init__(self, sources):
+        self.sources = sources
+
+    def http_open(self, req):
+        return self.respond(req)
+
+    def https_open(self, req):
+        return self.respond(req)
+
+    def respond(self, req):
+        headers = email.message.Message()
+        source = self.sources.get(req.full_url)
+        if source is None:
+            # Meta and validators blobs are never there, as on a first import.
+            response = urllib.response.addinfourl(io.BytesIO(), headers, req.full_url, 404)
+            response.msg = 'Not Found'
+            return response
+        path, source_headers = source
+        headers['Last-Modified'] = LAST_MODIFIED
+        for name, value in source_headers.items():
+            headers[name] = value
+        response = urllib.response.addinfourl(open(path, 'rb'), headers, req.full_url, 200)
+        response.msg = 'OK'
+        return response
+
+
+def install(storage, blob_service_client, sources):
+    storage.get_blob_service_client = lambda: blob_service_client
+    urllib.request.install_opener(urllib.request.build_opener(StandInHandler(sources)))
@@ -0,0 +1,68 @@
+"""Times the Treasury advanced XML extraction on a synthetic cons_advanced.xml.
+
+    python -m benchmarks.treasury_extract --entries 5000 --engine dom
+    python -m benchmarks.treasury_extract --entries 25000 --engine streaming
+
+The fixture is written in a child process so the reported peak RSS only covers
+parsing and extraction.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from sanctions_list_parser import StreamingTreasuryProcessor, TreasuryProcessor
+
+from . import fixtures
+
+
+def run_dom(path):
+    processor = TreasuryProcessor(path)
+    entries_by_list_id = processor.get_sanctions_entries_by_list_ids(fixtures.NON_SDN_LIST_IDS)
+    return sum(len(entries) for entries in entries_by_list_id.values())
+
+
+def run_streaming(path):
+    processor = StreamingTreasuryProcessor(path)
+    return sum(1 for _ in processor.iter_sanctions_entries(fixtures.NON_SDN_LIST_IDS))
+
+
+ENGINES = {
+    'dom': run_dom,
+    'streaming': run_streaming
+}
+
+
+def write_fixture(path, entries, seed):
+    with open(path, 'w', encoding='utf-8') as f:
+        fixtures.write_advanced_xml(f, entries, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='dom')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cons_advanced.xml')
+        writer = multiprocessing.Process(target=write_fixture, args=(path, args.entries, args.seed))
+        writer.start()
+        writer.join()
+        size_mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        count = ENGINES[args.engine](path)
+        elapsed = time.perf_counter() - start
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{args.engine}: {args.entries} entries, {size_mb:.1f} MB')
+    print(f'extracted {count} entries in {elapsed:.2f}s ({count / elapsed:.0f} entries/s)')
+    print(f'peak RSS: {peak_rss_mb:.0f} MB')
+
+
+if __name__ == '__main__':
+    main()
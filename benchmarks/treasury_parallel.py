@@ -0,0 +1,80 @@
+"""Measures the speedup of the parallel Treasury transformation over the serial one.
+
+    python -m benchmarks.treasury_parallel --entries 25000 --workers 1 2 4
+
+Each worker count runs in a fresh child process on the same synthetic
+cons_advanced.xml. One worker is the serial path. The speedup is relative to
+the first worker count given, and a digest of the transformed entries shows
+whether every run produced the same output in the same order. No speedup is
+possible beyond the number of CPUs on the machine.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sanctions_list_parser import TreasuryProcessor
+
+from . import fixtures
+from .treasury_extract import write_fixture
+
+
+def run_workers(path, workers, conn):
+    start = time.perf_counter()
+    processor = TreasuryProcessor(path, workers)
+    digest = hashlib.sha256()
+    count = 0
+    for list_id, entry in processor.iter_sanctions_entries(fixtures.NON_SDN_LIST_IDS):
+        digest.update(json.dumps([list_id, entry], sort_keys=True, default=str).encode())
+        count += 1
+    conn.send({
+        'count': count,
+        'seconds': time.perf_counter() - start,
+        'digest': digest.hexdigest()
+    })
+
+
+def measure(path, workers):
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=run_workers, args=(path, workers, sender))
+    process.start()
+    sender.close()
+    try:
+        return receiver.recv()
+    except EOFError:
+        raise RuntimeError(f'run with {workers} workers failed') from None
+    finally:
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=25000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cons_advanced.xml')
+        writer = multiprocessing.Process(target=write_fixture, args=(path, args.entries, args.seed))
+        writer.start()
+        writer.join()
+
+        print(f'{os.cpu_count()} CPUs, {os.path.getsize(path) / 1e6:.1f} MB fixture')
+        print(f'{"workers":>7} {"entries":>8} {"seconds":>8} {"speedup":>8}  digest')
+        baseline = None
+        digests = set()
+        for workers in args.workers:
+            result = measure(path, workers)
+            baseline = baseline or result['seconds']
+            digests.add(result['digest'])
+            print(f'{workers:>7} {result["count"]:>8} {result["seconds"]:>8.2f} '
+                  f'{baseline / result["seconds"]:>7.2f}x  {result["digest"][:12]}')
+        print(f'outputs identical: {"yes" if len(digests) == 1 else "NO"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Compares the ElementTree and lxml parser backends on the SDN and advanced XML.
+
+    python -m benchmarks.xml_backends --sdn-entries 12000 --treasury-entries 5000
+
+Each format is parsed and extracted once per backend in a fresh child process,
+with XML_BACKEND selecting the backend before the app modules are imported.
+The advanced XML goes through both the streaming and the DOM processor. A
+digest of the extracted documents shows whether both backends produced the
+same output, and the exit status is 1 when they did not. lxml is skipped when
+it is not installed.
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from . import fixtures
+from .app import import_app_module
+
+
+def extract_sdn(path):
+    sdn_data = import_app_module('SdnDataTimer.sdn_data')
+    with open(path, 'rb') as source:
+        yield from (doc for _, doc in sdn_data.iter_outputs(source))
+
+
+def extract_advanced(path):
+    sanctions_list_parser = import_app_module('sanctions_list_parser')
+    processor = sanctions_list_parser.StreamingTreasuryProcessor(path)
+    yield from (entry for _, entry in processor.iter_sanctions_entries(fixtures.NON_SDN_LIST_IDS))
+
+
+def extract_advanced_dom(path):
+    sanctions_list_parser = import_app_module('sanctions_list_parser')
+    processor = sanctions_list_parser.TreasuryProcessor(path)
+    yield from (entry for _, entry in processor.iter_sanctions_entries(fixtures.NON_SDN_LIST_IDS))
+
+
+FORMATS = {
+    'sdn': ('sdn.xml', fixtures.write_sdn_xml, extract_sdn),
+    'advanced': ('cons_advanced.xml', fixtures.write_advanced_xml, extract_advanced),
+    'dom': ('cons_advanced.xml', fixtures.write_advanced_xml, extract_advanced_dom)
+}
+
+
+def write_fixtures(directory, entries):
+    for name, (filename, write, _) in FORMATS.items():
+        path = os.path.join(directory, filename)
+        # The DOM and streaming runs share the advanced XML.
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                write(f, entries[name])
+
+
+def run_backend(backend, name, path, conn):
+    os.environ['XML_BACKEND'] = backend
+    xml_parser = import_app_module('sanctions_list_parser.xml_parser')
+    extract = FORMATS[name][2]
+    digest = hashlib.sha256()
+    count = 0
+    start = time.perf_counter()
+    for doc in extract(path):
+        digest.update(json.dumps(doc, sort_keys=True).encode())
+        count += 1
+    elapsed = time.perf_counter() - start
+    conn.send({
+        'backend': xml_parser.backend,
+        'count': count,
+        'seconds': elapsed,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'digest': digest.hexdigest()
+    })
+
+
+def measure(backend, name, path):
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=run_backend, args=(backend, name, path, sender))
+    process.start()
+    sender.close()
+    try:
+        return receiver.recv()
+    finally:
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sdn-entries', type=int, default=12000)
+    parser.add_argument('--treasury-entries', type=int, default=5000)
+    args = parser.parse_args()
+
+    backends = ['etree']
+    if importlib.util.find_spec('lxml') is not None:
+        backends.append('lxml')
+    else:
+        print('lxml is not installed, only measuring ElementTree')
+
+    mismatched = False
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = multiprocessing.Process(target=write_fixtures, args=(tmp, {
+            'sdn': args.sdn_entries,
+            'advanced': args.treasury_entries,
+            'dom': args.treasury_entries
+        }))
+        writer.start()
+        writer.join()
+
+        print(f'{"format":<9} {"backend":<7} {"size MB":>8} {"entries":>8} {"seconds":>8} {"MB/s":>6} {"RSS MB":>7}  digest')
+        for name, (filename, _, _) in FORMATS.items():
+            path = os.path.join(tmp, filename)
+            size_mb = os.path.getsize(path) / 1e6
+            digests = set()
+            for backend in backends:
+                result = measure(backend, name, path)
+                digests.add(result['digest'])
+                print(f'{name:<9} {result["backend"]:<7} {size_mb:>8.1f} {result["count"]:>8} {result["seconds"]:>8.2f} '
+                      f'{size_mb / result["seconds"]:>6.1f} {result["peak_rss_mb"]:>7.0f}  {result["digest"][:12]}')
+            if len(backends) > 1:
+                mismatched = mismatched or len(digests) > 1
+                print(f'{name} outputs identical: {"yes" if len(digests) == 1 else "NO"}')
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == '__main__':
+    main()
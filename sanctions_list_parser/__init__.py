@@ -1,2 +1,4 @@
 from .treasury_extractor import TreasuryExtractor
 from .treasury_processor import TreasuryProcessor
+from .streaming_treasury_extractor import StreamingTreasuryExtractor
+from .streaming_treasury_processor import StreamingTreasuryProcessor
@@ -1,9 +1,23 @@
+import sys
+
+from collections import namedtuple
+
 from .reference_value_set_extractor import ReferenceValueSetExtractor
 
+Country = namedtuple('Country', ['id', 'value', 'iso2'])
+
 
 class CountrySetExtractor(ReferenceValueSetExtractor):
 
+    def __init__(self, reference_value_sets, element_name):
+        # Both directions share the same records and are filled in one pass.
+        self.value_to_entry_dict = {}
+        super().__init__(reference_value_sets, element_name)
+
+    def _add_entry(self, entry):
+        super()._add_entry(entry)
+        self.value_to_entry_dict[entry.value] = entry
+
     def _build_entry(self, element):
-        entry = super()._build_entry(element)
-        entry['iso2'] = element.attrib.get('ISO2')
-        return entry
+        iso2 = element.attrib.get('ISO2')
+        return Country(*self._build_fields(element), iso2 and sys.intern(iso2))
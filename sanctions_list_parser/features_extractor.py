@@ -1,10 +1,9 @@
 import datetime
 
-from . import location_extractor
 from . import xpath_finder as finder
 
 
-def extract(reference_dict, root, profile):
+def extract(reference_dict, index_dict, profile):
     features_list = []
 
     for f in finder.find_features(profile):
@@ -12,9 +11,9 @@ def extract(reference_dict, root, profile):
         version_location = finder.find_version_location(f)
         feature_value = None
         if version_detail is not None:
-            feature_value = __extract_feature_with_version_detail(reference_dict, root, f, version_detail, version_location)
+            feature_value = __extract_feature_with_version_detail(reference_dict, index_dict, f, version_detail, version_location)
         elif version_location is not None:
-            feature_value = __extract_feature_with_version_location(reference_dict, root, version_location)
+            feature_value = __extract_feature_with_version_location(reference_dict, index_dict, version_location)
 
         if feature_value is not None:
             feature_type = __get_feature_type(reference_dict, f)
@@ -23,7 +22,7 @@ def extract(reference_dict, root, profile):
     return features_list
 
 
-def __extract_feature_with_version_detail(reference_dict, root, feature, version_detail, version_location):
+def __extract_feature_with_version_detail(reference_dict, index_dict, feature, version_detail, version_location):
     detail_type = __get_detail_type(reference_dict, version_detail)
     feature_value = None
     if detail_type == 'DATE':
@@ -36,7 +35,7 @@ def __extract_feature_with_version_detail(reference_dict, root, feature, version
     elif detail_type == 'TEXT':
         feature_value = __extract_version_detail_text(version_detail)
     elif detail_type == 'COUNTRY':
-        feature_value = __extract_country(reference_dict, root, version_location)
+        feature_value = __extract_country(reference_dict, index_dict, version_location)
 
     return feature_value
 
@@ -77,35 +76,35 @@ def __is_same_year_range(start_from, start_to, end_from, end_to):
     ])
 
 
-def __extract_feature_with_version_location(reference_dict, root, version_location):
+def __extract_feature_with_version_location(reference_dict, index_dict, version_location):
     location_id = int(version_location.attrib['LocationID'])
-    location_dict = location_extractor.extract(reference_dict, root, location_id)
+    location_dict = index_dict['Location'][location_id]
     return location_dict if location_dict else None
 
 
 def __get_feature_type(reference_dict, feature):
     feature_type_id = int(feature.attrib['FeatureTypeID'])
-    return reference_dict['FeatureType'][feature_type_id]['value']
+    return reference_dict['FeatureType'][feature_type_id].value
 
 
 def __get_detail_type(reference_dict, version_detail):
     detail_type_id = int(version_detail.attrib['DetailTypeID'])
-    return reference_dict['DetailType'][detail_type_id]['value']
+    return reference_dict['DetailType'][detail_type_id].value
 
 
 def __extract_version_detail_lookup(detail_reference_dict, version_detail):
     detail_reference_id = int(version_detail.attrib['DetailReferenceID'])
-    return detail_reference_dict[detail_reference_id]['value']
+    return detail_reference_dict[detail_reference_id].value
 
 
 def __extract_version_detail_text(version_detail):
     return version_detail.text.strip()
 
 
-def __extract_country(reference_dict, root, version_location):
+def __extract_country(reference_dict, index_dict, version_location):
     location_id = int(version_location.attrib['LocationID'])
-    location_dict = location_extractor.extract(reference_dict, root, location_id)
+    location_dict = index_dict['Location'][location_id]
     country = location_dict['Unknown']
     reverse_country_reference_dict = reference_dict['ReverseCountry']
-    country_iso2 = reverse_country_reference_dict[country]['iso2']
+    country_iso2 = reverse_country_reference_dict[country].iso2
     return country_iso2
@@ -0,0 +1,22 @@
+from . import xpath_finder as finder
+
+
+def extract(reference_dict, id_reg_doc):
+    country_reference_dict = reference_dict['Country']
+    id_reg_doc_reference_dict = reference_dict['IDRegDocType']
+
+    id_reg_doc_type_id = int(id_reg_doc.attrib['IDRegDocTypeID'])
+    id_reg_doc_type = id_reg_doc_reference_dict[id_reg_doc_type_id].value
+    id_reg_no = finder.find_id_registration_no(id_reg_doc).text.strip()
+
+    id_registration = {
+        'IdRegDocType': id_reg_doc_type,
+        'IdRegNo': id_reg_no,
+    }
+
+    if 'IssuedBy-CountryID' in id_reg_doc.attrib:
+        country_id = int(id_reg_doc.attrib['IssuedBy-CountryID'])
+        country = country_reference_dict[country_id].iso2
+        id_registration['Country'] = country
+
+    return id_registration
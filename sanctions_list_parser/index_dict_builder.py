@@ -0,0 +1,38 @@
+from . import id_reg_document_extractor
+from . import location_extractor
+from . import xpath_finder as finder
+
+
+def build(reference_dict, root):
+    index_dict = {
+        'DistinctParty': {},
+        'IDRegDocument': {},
+        'Location': {}
+    }
+
+    for distinct_party in finder.find_all_distinct_parties(root):
+        add_distinct_party(index_dict, distinct_party)
+
+    for id_reg_document in finder.find_all_id_reg_documents(root):
+        add_id_reg_document(reference_dict, index_dict, id_reg_document)
+
+    for location in finder.find_all_locations(root):
+        add_location(reference_dict, index_dict, location)
+
+    return index_dict
+
+
+def add_distinct_party(index_dict, distinct_party):
+    index_dict['DistinctParty'].setdefault(int(distinct_party.attrib['FixedRef']), distinct_party)
+
+
+def add_id_reg_document(reference_dict, index_dict, id_reg_document):
+    identity_id = int(id_reg_document.attrib['IdentityID'])
+    id_registration = id_reg_document_extractor.extract(reference_dict, id_reg_document)
+    index_dict['IDRegDocument'].setdefault(identity_id, []).append(id_registration)
+
+
+def add_location(reference_dict, index_dict, location):
+    location_id = int(location.attrib['ID'])
+    if location_id not in index_dict['Location']:
+        index_dict['Location'][location_id] = location_extractor.extract(reference_dict, location)
@@ -1,9 +1,8 @@
 from . import xpath_finder as finder
 
 
-def extract(reference_dict, root, location_id):
+def extract(reference_dict, location):
     loc_part_type_reference_dict = reference_dict['LocPartType']
-    location = finder.find_location(root, location_id)
     location_part_dict = {}
 
     location_country = __extract_location_country(reference_dict, location)
@@ -12,7 +11,7 @@ def extract(reference_dict, root, location_id):
 
     for location_part in finder.find_location_parts(location):
         loc_part_type_id = int(location_part.attrib['LocPartTypeID'])
-        loc_part_type = loc_part_type_reference_dict[loc_part_type_id]['value']
+        loc_part_type = loc_part_type_reference_dict[loc_part_type_id].value
         loc_part_value = __extract_location_part_value(location_part)
         location_part_dict[loc_part_type] = loc_part_value
 
@@ -24,7 +23,7 @@ def __extract_location_country(reference_dict, location):
     country_iso2 = None
     if location_country is not None:
         country_id = int(location_country.attrib['CountryID'])
-        country_iso2 = reference_dict['Country'][country_id]['iso2']
+        country_iso2 = reference_dict['Country'][country_id].iso2
 
     return country_iso2
 
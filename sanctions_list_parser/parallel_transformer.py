@@ -0,0 +1,59 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+from . import csl_transformer
+from . import distinct_party_extractor
+from . import xml_parser
+from . import xpath_finder as finder
+
+# Processes extracting and transforming sanctions entries after the parse.
+# Unset or 1 keeps everything in the parsing process.
+WORKERS_ENV = 'TREASURY_TRANSFORM_WORKERS'
+CHUNK_SIZE = 64
+
+_reference_dict = None
+
+
+def get_worker_count():
+    return max(int(os.environ.get(WORKERS_ENV) or 1), 1)
+
+
+def make_payload(index_dict, entry_id, sanctions_measures, profile_id):
+    # Workers get the party as XML with only the locations and ID documents it
+    # references, instead of the whole index.
+    distinct_party = index_dict['DistinctParty'][profile_id]
+    location_ids = {int(v.attrib['LocationID']) for v in distinct_party.iter(finder.VERSION_LOCATION_TAG)}
+    identity_ids = {int(i.attrib['ID']) for i in distinct_party.iter(finder.IDENTITY_TAG)}
+    return (
+        entry_id,
+        sanctions_measures,
+        profile_id,
+        xml_parser.tostring(distinct_party),
+        {i: index_dict['Location'][i] for i in location_ids if i in index_dict['Location']},
+        {i: index_dict['IDRegDocument'][i] for i in identity_ids if i in index_dict['IDRegDocument']}
+    )
+
+
+def transform(reference_dict, payloads, workers):
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(reference_dict,)) as executor:
+        return list(executor.map(transform_payload, payloads, chunksize=CHUNK_SIZE))
+
+
+def init_worker(reference_dict):
+    global _reference_dict
+    _reference_dict = reference_dict
+
+
+def transform_payload(payload):
+    entry_id, sanctions_measures, profile_id, distinct_party_xml, locations, id_registrations = payload
+    index_dict = {
+        'DistinctParty': {profile_id: xml_parser.fromstring(distinct_party_xml)},
+        'IDRegDocument': id_registrations,
+        'Location': locations
+    }
+    return csl_transformer.transform({
+        'id': entry_id,
+        'sanctions_measures': sanctions_measures,
+        'distinct_party': distinct_party_extractor.extract(_reference_dict, index_dict, profile_id)
+    })
@@ -1,10 +1,12 @@
+from collections import namedtuple
+
 from .reference_value_set_extractor import ReferenceValueSetExtractor
 
+PartySubType = namedtuple('PartySubType', ['id', 'value', 'party_type_id'])
+
 
 class PartySubTypeExtractor(ReferenceValueSetExtractor):
 
     def _build_entry(self, element):
-        item = super()._build_entry(element)
         party_type_id = int(element.attrib['PartyTypeID'])
-        item['party_type_id'] = party_type_id
-        return item
+        return PartySubType(*self._build_fields(element), party_type_id)
@@ -1,22 +1,27 @@
 from .country_set_extractor import CountrySetExtractor
 from .party_sub_type_extractor import PartySubTypeExtractor
 from .reference_value_set_extractor import ReferenceValueSetExtractor
-from .reverse_country_set_extractor import ReverseCountrySetExtractor
+from . import xpath_finder as finder
 
 
 def build(root):
+    return build_from_reference_value_sets(finder.find_reference_value_sets(root))
+
+
+def build_from_reference_value_sets(reference_value_sets):
+    countries = CountrySetExtractor(reference_value_sets, 'Country')
     return {
-        'AliasType': ReferenceValueSetExtractor(root, 'AliasType').id_to_entry_dict,
-        'Country': CountrySetExtractor(root, 'Country').id_to_entry_dict,
-        'DetailReference': ReferenceValueSetExtractor(root, 'DetailReference').id_to_entry_dict,
-        'DetailType': ReferenceValueSetExtractor(root, 'DetailType').id_to_entry_dict,
-        'FeatureType': ReferenceValueSetExtractor(root, 'FeatureType').id_to_entry_dict,
-        'IDRegDocType': ReferenceValueSetExtractor(root, 'IDRegDocType').id_to_entry_dict,
-        'List': ReferenceValueSetExtractor(root, 'List').id_to_entry_dict,
-        'LocPartType': ReferenceValueSetExtractor(root, 'LocPartType').id_to_entry_dict,
-        'NamePartType': ReferenceValueSetExtractor(root, 'NamePartType').id_to_entry_dict,
-        'PartySubType': PartySubTypeExtractor(root, 'PartySubType').id_to_entry_dict,
-        'PartyType': ReferenceValueSetExtractor(root, 'PartyType').id_to_entry_dict,
-        'ReverseCountry': ReverseCountrySetExtractor(root, 'Country').id_to_entry_dict,
-        'SanctionsProgram': ReferenceValueSetExtractor(root, 'SanctionsProgram').id_to_entry_dict
+        'AliasType': ReferenceValueSetExtractor(reference_value_sets, 'AliasType').id_to_entry_dict,
+        'Country': countries.id_to_entry_dict,
+        'DetailReference': ReferenceValueSetExtractor(reference_value_sets, 'DetailReference').id_to_entry_dict,
+        'DetailType': ReferenceValueSetExtractor(reference_value_sets, 'DetailType').id_to_entry_dict,
+        'FeatureType': ReferenceValueSetExtractor(reference_value_sets, 'FeatureType').id_to_entry_dict,
+        'IDRegDocType': ReferenceValueSetExtractor(reference_value_sets, 'IDRegDocType').id_to_entry_dict,
+        'List': ReferenceValueSetExtractor(reference_value_sets, 'List').id_to_entry_dict,
+        'LocPartType': ReferenceValueSetExtractor(reference_value_sets, 'LocPartType').id_to_entry_dict,
+        'NamePartType': ReferenceValueSetExtractor(reference_value_sets, 'NamePartType').id_to_entry_dict,
+        'PartySubType': PartySubTypeExtractor(reference_value_sets, 'PartySubType').id_to_entry_dict,
+        'PartyType': ReferenceValueSetExtractor(reference_value_sets, 'PartyType').id_to_entry_dict,
+        'ReverseCountry': countries.value_to_entry_dict,
+        'SanctionsProgram': ReferenceValueSetExtractor(reference_value_sets, 'SanctionsProgram').id_to_entry_dict
     }
@@ -1,21 +1,29 @@
+import sys
+
+from collections import namedtuple
+
 from . import xpath_finder as finder
 
+# Tuple records instead of a dict per reference value. Values are interned so the
+# strings copied into every transformed entry are shared.
+ReferenceValue = namedtuple('ReferenceValue', ['id', 'value'])
+
 
 class ReferenceValueSetExtractor:
-    _key_field_name = 'id'
 
-    def __init__(self, root, element_name):
+    def __init__(self, reference_value_sets, element_name):
         self.id_to_entry_dict = {}
-        cls = self.__class__
-        for e in finder.find_all_reference_values(root, element_name):
+        for e in finder.find_all_reference_values(reference_value_sets, element_name):
             entry = self._build_entry(e)
-            self.id_to_entry_dict[entry[cls._key_field_name]] = entry
+            self._add_entry(entry)
+
+    def _add_entry(self, entry):
+        self.id_to_entry_dict[entry.id] = entry
 
     def _build_entry(self, element):
-        element_id = int(element.attrib['ID'])
-        element_text = element.text.strip()
+        return ReferenceValue(*self._build_fields(element))
 
-        return {
-            'id': element_id,
-            'value': element_text
-        }
+    def _build_fields(self, element):
+        element_id = int(element.attrib['ID'])
+        element_text = sys.intern(element.text.strip())
+        return element_id, element_text
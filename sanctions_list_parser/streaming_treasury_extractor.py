@@ -0,0 +1,116 @@
+import marshal
+
+from collections import deque
+
+from . import distinct_party_extractor
+from . import index_dict_builder
+from . import reference_dict_builder
+from . import sanctions_measures_extractor
+from . import xml_parser
+from . import xpath_finder as finder
+
+REFERENCE_VALUE_SETS_TAG = finder.qualified_tag('ReferenceValueSets')
+LOCATIONS_TAG = finder.qualified_tag('Locations')
+LOCATION_TAG = finder.qualified_tag('Location')
+ID_REG_DOCUMENTS_TAG = finder.qualified_tag('IDRegDocuments')
+ID_REG_DOCUMENT_TAG = finder.qualified_tag('IDRegDocument')
+DISTINCT_PARTIES_TAG = finder.qualified_tag('DistinctParties')
+DISTINCT_PARTY_TAG = finder.qualified_tag('DistinctParty')
+SANCTIONS_ENTRY_TAG = finder.qualified_tag('SanctionsEntry')
+
+DISTINCT_PARTY_DEPENDENCY_TAGS = frozenset([REFERENCE_VALUE_SETS_TAG, LOCATIONS_TAG, ID_REG_DOCUMENTS_TAG])
+
+
+class StreamingTreasuryExtractor:
+
+    def __init__(self, source):
+        self._source = source
+        self._reference_dict = None
+        self._index_dict = {
+            'DistinctParty': {},
+            'IDRegDocument': {},
+            'Location': {}
+        }
+        self._completed_sections = set()
+        self._unresolved_elements = []
+        self._distinct_parties = {}
+        self._pending_entries = deque()
+
+    def iter_sanctions_entries(self, list_ids):
+        list_ids = frozenset(list_ids)
+        path = []
+        for event, element in xml_parser.iterparse(self._source):
+            if event == 'start':
+                path.append(element)
+                continue
+
+            path.pop()
+            if len(path) == 2 and path[1].tag != REFERENCE_VALUE_SETS_TAG:
+                self._consume_section_item(element, list_ids)
+                path[1].remove(element)
+                yield from self._pop_resolved_entries()
+            elif len(path) == 1:
+                self._complete_section(element)
+                path[0].remove(element)
+                yield from self._pop_resolved_entries()
+
+        self._extract_distinct_parties()
+        yield from self._pop_resolved_entries()
+        if self._pending_entries:
+            raise KeyError(self._pending_entries[0][2])
+
+    def _consume_section_item(self, element, list_ids):
+        tag = element.tag
+        if tag in (LOCATION_TAG, ID_REG_DOCUMENT_TAG):
+            if self._reference_dict is None:
+                self._unresolved_elements.append(element)
+            else:
+                self._add_to_index(element)
+        elif tag == DISTINCT_PARTY_TAG:
+            index_dict_builder.add_distinct_party(self._index_dict, element)
+            if DISTINCT_PARTY_DEPENDENCY_TAGS <= self._completed_sections:
+                self._extract_distinct_parties()
+        elif tag == SANCTIONS_ENTRY_TAG:
+            list_id = int(element.attrib['ListID'])
+            if list_id in list_ids:
+                self._pending_entries.append((
+                    list_id,
+                    int(element.attrib['ID']),
+                    int(element.attrib['ProfileID']),
+                    sanctions_measures_extractor.extract(element)
+                ))
+
+    def _complete_section(self, element):
+        if element.tag == REFERENCE_VALUE_SETS_TAG:
+            self._reference_dict = reference_dict_builder.build_from_reference_value_sets(element)
+            for unresolved_element in self._unresolved_elements:
+                self._add_to_index(unresolved_element)
+            self._unresolved_elements.clear()
+        self._completed_sections.add(element.tag)
+        if DISTINCT_PARTY_DEPENDENCY_TAGS <= self._completed_sections:
+            self._extract_distinct_parties()
+        if DISTINCT_PARTIES_TAG in self._completed_sections and not self._index_dict['DistinctParty']:
+            self._index_dict['IDRegDocument'].clear()
+            self._index_dict['Location'].clear()
+
+    def _add_to_index(self, element):
+        if element.tag == LOCATION_TAG:
+            index_dict_builder.add_location(self._reference_dict, self._index_dict, element)
+        else:
+            index_dict_builder.add_id_reg_document(self._reference_dict, self._index_dict, element)
+
+    def _extract_distinct_parties(self):
+        distinct_party_dict = self._index_dict['DistinctParty']
+        for profile_id in list(distinct_party_dict):
+            distinct_party = distinct_party_extractor.extract(self._reference_dict, self._index_dict, profile_id)
+            self._distinct_parties.setdefault(profile_id, marshal.dumps(distinct_party))
+            del distinct_party_dict[profile_id]
+
+    def _pop_resolved_entries(self):
+        while self._pending_entries and self._pending_entries[0][2] in self._distinct_parties:
+            list_id, entry_id, profile_id, sanctions_measures = self._pending_entries.popleft()
+            yield list_id, {
+                'id': entry_id,
+                'sanctions_measures': sanctions_measures,
+                'distinct_party': marshal.loads(self._distinct_parties[profile_id])
+            }
@@ -0,0 +1,12 @@
+from . import csl_transformer
+from .streaming_treasury_extractor import StreamingTreasuryExtractor
+
+
+class StreamingTreasuryProcessor:
+
+    def __init__(self, source):
+        self.__extractor = StreamingTreasuryExtractor(source)
+
+    def iter_sanctions_entries(self, list_ids):
+        for list_id, entry in self.__extractor.iter_sanctions_entries(list_ids):
+            yield list_id, csl_transformer.transform(entry)
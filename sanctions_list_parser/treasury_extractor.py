@@ -1,4 +1,6 @@
 from . import distinct_party_extractor
+from . import index_dict_builder
+from . import parallel_transformer
 from . import reference_dict_builder
 from . import sanctions_measures_extractor
 from . import xml_parser
@@ -10,20 +12,45 @@ class TreasuryExtractor:
     def __init__(self, source):
         self._root = xml_parser.get_root(source)
         self._reference_dict = reference_dict_builder.build(self._root)
+        self._index_dict = index_dict_builder.build(self._reference_dict, self._root)
 
     def extract_sanctions_entries(self, list_id):
-        entries = {}
-        for e in finder.find_sanctions_entries_by_list_id(self._root, list_id):
+        return self.extract_sanctions_entries_by_list_ids([list_id])[list_id]
+
+    @property
+    def reference_dict(self):
+        return self._reference_dict
+
+    def extract_sanctions_entries_by_list_ids(self, list_ids):
+        return self.__extract_by_list_ids(list_ids, self.__extract_entry)
+
+    def extract_payloads_by_list_ids(self, list_ids):
+        # Compact picklable entries for parallel_transformer, keyed like the extracted entries.
+        return self.__extract_by_list_ids(list_ids, self.__extract_payload)
+
+    def __extract_by_list_ids(self, list_ids, extract):
+        entries_by_list_id = {list_id: {} for list_id in list_ids}
+        for e in finder.find_all_sanctions_entries(self._root):
+            entries = entries_by_list_id.get(int(e.attrib['ListID']))
+            if entries is None:
+                continue
+
             entry_id = int(e.attrib['ID'])
-            sanctions_measures = sanctions_measures_extractor.extract(e)
-            distinct_party = distinct_party_extractor.extract(
-                self._reference_dict, self._root, int(e.attrib['ProfileID']))
-
-            entry = {
-                'id': entry_id,
-                'sanctions_measures': sanctions_measures,
-                'distinct_party': distinct_party
-            }
-            entries[entry_id] = entry
-
-        return entries
+            entries[entry_id] = extract(e, entry_id)
+
+        return entries_by_list_id
+
+    def __extract_entry(self, e, entry_id):
+        sanctions_measures = sanctions_measures_extractor.extract(e)
+        distinct_party = distinct_party_extractor.extract(
+            self._reference_dict, self._index_dict, int(e.attrib['ProfileID']))
+
+        return {
+            'id': entry_id,
+            'sanctions_measures': sanctions_measures,
+            'distinct_party': distinct_party
+        }
+
+    def __extract_payload(self, e, entry_id):
+        return parallel_transformer.make_payload(
+            self._index_dict, entry_id, sanctions_measures_extractor.extract(e), int(e.attrib['ProfileID']))
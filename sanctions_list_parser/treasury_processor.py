@@ -1,12 +1,37 @@
 from . import csl_transformer
+from . import parallel_transformer
 from .treasury_extractor import TreasuryExtractor
 
 
 class TreasuryProcessor:
 
-    def __init__(self, source):
+    def __init__(self, source, workers=None):
         self.__extractor = TreasuryExtractor(source)
+        self.__workers = workers or parallel_transformer.get_worker_count()
 
     def get_sanctions_entries(self, list_id):
-        entries = self.__extractor.extract_sanctions_entries(list_id)
-        return [csl_transformer.transform(entry) for entry in entries.values()]
+        return self.get_sanctions_entries_by_list_ids([list_id])[list_id]
+
+    def get_sanctions_entries_by_list_ids(self, list_ids):
+        if self.__workers > 1:
+            return self.__transform_in_parallel(list_ids)
+        entries_by_list_id = self.__extractor.extract_sanctions_entries_by_list_ids(list_ids)
+        return {
+            list_id: [csl_transformer.transform(entry) for entry in entries.values()]
+            for list_id, entries in entries_by_list_id.items()
+        }
+
+    def iter_sanctions_entries(self, list_ids):
+        for list_id, entries in self.get_sanctions_entries_by_list_ids(list_ids).items():
+            for entry in entries:
+                yield list_id, entry
+
+    def __transform_in_parallel(self, list_ids):
+        payloads_by_list_id = self.__extractor.extract_payloads_by_list_ids(list_ids)
+        payloads = [payload for payloads in payloads_by_list_id.values() for payload in payloads.values()]
+        transformed = iter(parallel_transformer.transform(self.__extractor.reference_dict, payloads, self.__workers))
+        # Results come back in payload order, so each list takes its entries off the front.
+        return {
+            list_id: [next(transformed) for _ in payloads.values()]
+            for list_id, payloads in payloads_by_list_id.items()
+        }
@@ -1,6 +1,51 @@
+import os
 import xml.etree.ElementTree as ElementTree
 
+# XML_BACKEND=lxml parses with lxml and queries with compiled XPath when it is installed.
+# The standard library parser stays the default, benchmarks/xml_backends.py checks
+# that both produce the same output.
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+if lxml_etree is not None and os.environ.get('XML_BACKEND', 'etree') == 'lxml':
+    backend = 'lxml'
+else:
+    backend = 'etree'
+
+# Comments and processing instructions would otherwise show up as lxml children.
+LXML_PARSER_OPTIONS = {'huge_tree': True, 'remove_comments': True, 'remove_pis': True}
+
 
 def get_root(source):
-    tree = ElementTree.parse(source)
+    if backend == 'lxml':
+        tree = lxml_etree.parse(source, lxml_etree.XMLParser(**LXML_PARSER_OPTIONS))
+    else:
+        tree = ElementTree.parse(source)
     return tree.getroot()
+
+
+def iterparse(source):
+    if backend == 'lxml':
+        return lxml_etree.iterparse(source, events=('start', 'end'), **LXML_PARSER_OPTIONS)
+    return ElementTree.iterparse(source, events=('start', 'end'))
+
+
+def compile_xpath(path, namespaces):
+    # Only lxml elements can be queried with XPath, so callers keep an ElementTree path.
+    if backend == 'lxml':
+        return lxml_etree.XPath(path, namespaces=namespaces)
+    return None
+
+
+def tostring(element):
+    if backend == 'lxml':
+        return lxml_etree.tostring(element)
+    return ElementTree.tostring(element)
+
+
+def fromstring(data):
+    if backend == 'lxml':
+        return lxml_etree.fromstring(data, lxml_etree.XMLParser(**LXML_PARSER_OPTIONS))
+    return ElementTree.fromstring(data)
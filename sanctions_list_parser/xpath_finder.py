@@ -1,59 +1,130 @@
+from . import xml_parser
+
 NS = {'un': 'https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/ADVANCED_XML'}
 LATIN_SCRIPT_ID = 215
 PROGRAM_SANCTIONS_TYPE_ID = 1
 
 
-def find_all_reference_values(root, reference_value_element_name):
-    reference_value_sets = root.find('.//un:ReferenceValueSets', NS)
-    return reference_value_sets.findall(f'.//un:{reference_value_element_name}', NS)
+def qualified_tag(element_name):
+    return f'{{{NS["un"]}}}{element_name}'
+
+
+# Lookups only use these fixed tags with find/findall on children and iter on
+# descendants, which never reach the ElementPath compiler and its small cache.
+# Attribute values are compared in Python instead of being formatted into paths.
+ALIAS_TAG = qualified_tag('Alias')
+COMMENT_TAG = qualified_tag('Comment')
+DATE_PERIOD_TAG = qualified_tag('DatePeriod')
+DISTINCT_PARTIES_TAG = qualified_tag('DistinctParties')
+DISTINCT_PARTY_TAG = qualified_tag('DistinctParty')
+FEATURE_TAG = qualified_tag('Feature')
+ID_REG_DOCUMENTS_TAG = qualified_tag('IDRegDocuments')
+ID_REG_DOCUMENT_TAG = qualified_tag('IDRegDocument')
+ID_REGISTRATION_NO_TAG = qualified_tag('IDRegistrationNo')
+IDENTITY_TAG = qualified_tag('Identity')
+LOCATION_COUNTRY_TAG = qualified_tag('LocationCountry')
+LOCATION_PART_TAG = qualified_tag('LocationPart')
+LOCATION_PART_VALUE_TAG = qualified_tag('LocationPartValue')
+LOCATIONS_TAG = qualified_tag('Locations')
+LOCATION_TAG = qualified_tag('Location')
+NAME_PART_GROUPS_TAG = qualified_tag('NamePartGroups')
+NAME_PART_GROUP_TAG = qualified_tag('NamePartGroup')
+NAME_PART_VALUE_TAG = qualified_tag('NamePartValue')
+PROFILE_TAG = qualified_tag('Profile')
+REFERENCE_VALUE_SETS_TAG = qualified_tag('ReferenceValueSets')
+SANCTIONS_ENTRIES_TAG = qualified_tag('SanctionsEntries')
+SANCTIONS_ENTRY_TAG = qualified_tag('SanctionsEntry')
+SANCTIONS_MEASURE_TAG = qualified_tag('SanctionsMeasure')
+VALUE_TAG = qualified_tag('Value')
+VERSION_DETAIL_TAG = qualified_tag('VersionDetail')
+VERSION_LOCATION_TAG = qualified_tag('VersionLocation')
+
+LATIN_SCRIPT_ID_VALUE = str(LATIN_SCRIPT_ID)
+PROGRAM_SANCTIONS_TYPE_ID_VALUE = str(PROGRAM_SANCTIONS_TYPE_ID)
+
+# With the lxml backend the attribute filters run as compiled XPath instead.
+PROFILE_XPATH = xml_parser.compile_xpath('./un:Profile[@ID=$profile_id]', NS)
+LATIN_NAME_PART_VALUES_XPATH = xml_parser.compile_xpath(f'.//un:NamePartValue[@ScriptID="{LATIN_SCRIPT_ID}"]', NS)
+NAME_PART_GROUPS_XPATH = xml_parser.compile_xpath('.//un:NamePartGroups//un:NamePartGroup', NS)
+PROGRAM_SANCTION_MEASURES_XPATH = xml_parser.compile_xpath(
+    f'.//un:SanctionsMeasure[@SanctionsTypeID="{PROGRAM_SANCTIONS_TYPE_ID}"]', NS)
+PRIMARY_LOCATION_PART_VALUE_XPATH = xml_parser.compile_xpath('.//un:LocationPartValue[@Primary="true"]/un:Value', NS)
+
+
+def find_descendant(element, tag):
+    return next(element.iter(tag), None)
 
 
-def find_sanctions_entries_by_list_id(root, list_id):
-    return root.findall(f'.//un:SanctionsEntries/un:SanctionsEntry[@ListID="{list_id}"]', NS)
+def find_all_nested(element, parent_tag, tag):
+    return [e for parent in element.iter(parent_tag) for e in parent.findall(tag)]
 
 
-def find_distinct_party(root, profile_id):
-    return root.find(f'.//un:DistinctParty[@FixedRef="{profile_id}"]', NS)
+def find_reference_value_sets(root):
+    return find_descendant(root, REFERENCE_VALUE_SETS_TAG)
+
+
+def find_all_reference_values(reference_value_sets, reference_value_element_name):
+    return list(reference_value_sets.iter(qualified_tag(reference_value_element_name)))
+
+
+def find_all_sanctions_entries(root):
+    return find_all_nested(root, SANCTIONS_ENTRIES_TAG, SANCTIONS_ENTRY_TAG)
+
+
+def find_all_distinct_parties(root):
+    return find_all_nested(root, DISTINCT_PARTIES_TAG, DISTINCT_PARTY_TAG)
 
 
 def find_profile(distinct_party, profile_id):
-    return distinct_party.find(f'./un:Profile[@ID="{profile_id}"]', NS)
+    profile_id = str(profile_id)
+    if PROFILE_XPATH is not None:
+        return next(iter(PROFILE_XPATH(distinct_party, profile_id=profile_id)), None)
+    for profile in distinct_party.findall(PROFILE_TAG):
+        if profile.get('ID') == profile_id:
+            return profile
+    return None
 
 
 def find_identity(profile):
-    return profile.find('./un:Identity', NS)
+    return profile.find(IDENTITY_TAG)
 
 
-def find_id_reg_documents(root, identity_id):
-    return root.findall(f'.//un:IDRegDocuments/un:IDRegDocument[@IdentityID="{identity_id}"]', NS)
+def find_all_id_reg_documents(root):
+    return find_all_nested(root, ID_REG_DOCUMENTS_TAG, ID_REG_DOCUMENT_TAG)
 
 
 def find_id_registration_no(id_reg_document):
-    return id_reg_document.find('./un:IDRegistrationNo', NS)
+    return id_reg_document.find(ID_REGISTRATION_NO_TAG)
 
 
 def find_features(profile):
-    return profile.findall('.//un:Feature', NS)
+    return list(profile.iter(FEATURE_TAG))
 
 
 def find_aliases(profile):
-    return profile.findall(f'.//un:Alias', NS)
+    return list(profile.iter(ALIAS_TAG))
 
 
 def find_latin_name_part_values(alias):
-    return alias.findall(f'.//un:NamePartValue[@ScriptID="{LATIN_SCRIPT_ID}"]', NS)
+    if LATIN_NAME_PART_VALUES_XPATH is not None:
+        return LATIN_NAME_PART_VALUES_XPATH(alias)
+    return [v for v in alias.iter(NAME_PART_VALUE_TAG) if v.get('ScriptID') == LATIN_SCRIPT_ID_VALUE]
 
 
 def find_name_part_groups(profile):
-    return profile.findall('.//un:NamePartGroups//un:NamePartGroup', NS)
+    if NAME_PART_GROUPS_XPATH is not None:
+        return NAME_PART_GROUPS_XPATH(profile)
+    return [g for groups in profile.iter(NAME_PART_GROUPS_TAG) for g in groups.iter(NAME_PART_GROUP_TAG)]
 
 
 def find_program_sanction_measures(entry):
-    return entry.findall(f'.//un:SanctionsMeasure[@SanctionsTypeID="{PROGRAM_SANCTIONS_TYPE_ID}"]', NS)
+    if PROGRAM_SANCTION_MEASURES_XPATH is not None:
+        return PROGRAM_SANCTION_MEASURES_XPATH(entry)
+    return [m for m in entry.iter(SANCTIONS_MEASURE_TAG) if m.get('SanctionsTypeID') == PROGRAM_SANCTIONS_TYPE_ID_VALUE]
 
 
 def find_comment(element):
-    comment = element.find('./un:Comment', NS)
+    comment = element.find(COMMENT_TAG)
     if comment is not None and comment.text is not None:
         return comment
     else:
@@ -61,36 +132,46 @@ def find_comment(element):
 
 
 def find_version_detail(feature):
-    return feature.find('.//un:VersionDetail', NS)
+    return find_descendant(feature, VERSION_DETAIL_TAG)
 
 
 def find_version_location(feature):
-    return feature.find('.//un:VersionLocation', NS)
+    return find_descendant(feature, VERSION_LOCATION_TAG)
 
 
 def find_date_period(feature):
-    return feature.find('.//un:DatePeriod', NS)
+    return find_descendant(feature, DATE_PERIOD_TAG)
 
 
 def find_date_point(boundary, start_or_from, date_period):
-    return date_period.find(f'./un:{boundary}/un:{start_or_from}', NS)
+    boundary_element = date_period.find(qualified_tag(boundary))
+    if boundary_element is None:
+        return None
+    return boundary_element.find(qualified_tag(start_or_from))
 
 
 def find_date_part(parent, date_part_name):
-    return parent.find(f'./un:{date_part_name}', NS)
+    return parent.find(qualified_tag(date_part_name))
 
 
-def find_location(root, location_id):
-    return root.find(f'.//un:Location[@ID="{location_id}"]', NS)
+def find_all_locations(root):
+    return find_all_nested(root, LOCATIONS_TAG, LOCATION_TAG)
 
 
 def find_location_parts(location):
-    return location.findall('.//un:LocationPart', NS)
+    return list(location.iter(LOCATION_PART_TAG))
 
 
 def find_primary_location_part_value(location_part):
-    return location_part.find('.//un:LocationPartValue[@Primary="true"]/un:Value', NS)
+    if PRIMARY_LOCATION_PART_VALUE_XPATH is not None:
+        return next(iter(PRIMARY_LOCATION_PART_VALUE_XPATH(location_part)), None)
+    for location_part_value in location_part.iter(LOCATION_PART_VALUE_TAG):
+        if location_part_value.get('Primary') == 'true':
+            value = location_part_value.find(VALUE_TAG)
+            if value is not None:
+                return value
+    return None
 
 
 def find_location_country(location):
-    return location.find('./un:LocationCountry', NS)
+    return location.find(LOCATION_COUNTRY_TAG)
@@ -1,56 +1,102 @@
-import pycountry
+import functools
+import json
+import os
+
+# Generated from pycountry with `python -m shared.country_code`, so that cold starts
+# do not have to import pycountry and load its database.
+country_codes_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'country_codes.json')
+
+country_code_overrides = {
+    'brunei': 'BN',
+    'bahamas, the': 'BS',
+    'burma': 'MM',
+    'cabo verde': 'CV',
+    'cabo verde.  previously cape verde.': 'CV',
+    'cote d ivoire': 'CI',
+    'congo, democratic republic of the': 'CG',
+    'congo, republic of the': 'CG',
+    'china': 'CN',
+    'crimea': 'crimea (occupied)',
+    'crimea (occupied)': 'crimea (occupied)',
+    'region: crimea': 'crimea (occupied)',
+    'the gambia': 'GM',
+    'honk kong': 'HK',
+    'kong kong': 'HK',
+    'iran': 'IR',
+    'korea, north': 'KP',
+    'north korea': 'KP',
+    'korea, south': 'KR',
+    'south korea': 'KR',
+    'kosovo': 'XK',
+    'macao': 'MO',
+    'moracco': 'MA',
+    'netherlands antilles': 'AN',
+    'north macedonia, the republic of': 'MK',
+    'palestinian': 'PS',
+    'region: gaza': 'PS',
+    'west bank': 'PS',
+    'russia': 'RU',
+    'syria': 'SY',
+    'uae': 'AE',
+    'u.a.e.': 'AE',
+    'united arab emirates (uae)': 'AE'
+}
+
+# The fields pycountry.countries.lookup matches, in the order it tries them.
+lookup_fields = ['alpha_2', 'alpha_3', 'flag', 'name', 'numeric', 'official_name', 'common_name']
+
+
+def build_country_codes():
+    import pycountry
+
+    country_codes = {}
+    for field in reversed(lookup_fields):
+        field_codes = {}
+        for country in pycountry.countries:
+            value = getattr(country, field, None)
+            if value is None:
+                continue
+            # Indexed fields keep the last country with a value, scanned fields the first.
+            if field in pycountry.countries.no_index:
+                field_codes.setdefault(value.lower(), country.alpha_2)
+            else:
+                field_codes[value.lower()] = country.alpha_2
+        country_codes.update(field_codes)
+    return country_codes
+
+
+def write_country_codes():
+    with open(country_codes_path, 'w', encoding='utf-8') as f:
+        json.dump(build_country_codes(), f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_country_codes():
+    with open(country_codes_path, encoding='utf-8') as f:
+        country_codes = json.load(f)
+    country_codes.update(country_code_overrides)
+    return country_codes
 
 
 def get_country_code(country_name):
     if len(country_name) == 0:
         return country_name
     country_name = country_name.lower()
-    if country_name == 'brunei':
-        return 'BN'
-    elif country_name == 'bahamas, the':
-        return 'BS'
-    elif country_name == 'burma':
-        return 'MM'
-    elif country_name in ['cabo verde', 'cabo verde.  previously cape verde.']:
-        return 'CV'
-    elif country_name == 'cote d ivoire':
-        return 'CI'
-    elif country_name.lower() in ['congo, democratic republic of the', 'congo, republic of the']:
-        return 'CG'
-    elif country_name.lower() == "china":
-        return "CN"
-    elif country_name in ['crimea', 'crimea (occupied)', 'region: crimea']:
-        return 'crimea (occupied)'
-    elif country_name == 'the gambia':
-        return 'GM'
-    elif country_name in ['honk kong', 'kong kong']:
-        return 'HK'
-    elif country_name == 'iran':
-        return 'IR'
-    elif country_name.lower() in ['korea, north', 'north korea']:
-        return 'KP'
-    elif country_name.lower() in ['korea, south', 'south korea']:
-        return 'KR'
-    elif country_name.lower() == 'kosovo':
-        return 'XK'
-    elif country_name == 'macao':
-        return 'MO'
-    elif country_name == 'moracco':
-        return 'MA'
-    elif country_name.lower() == 'netherlands antilles':
-        return 'AN'
-    elif country_name.lower() == 'north macedonia, the republic of':
-        return 'MK'
-    elif country_name.lower() in ['palestinian', 'region: gaza', 'west bank']:
-        return 'PS'
-    elif country_name == 'russia':
-        return 'RU'
-    elif country_name == 'syria':
-        return 'SY'
-    elif country_name in ['uae', 'u.a.e.', 'united arab emirates (uae)']:
-        return 'AE'
-    else:
-        try:
-            return pycountry.countries.lookup(country_name).alpha_2
-        except LookupError:
-            return country_name
+    try:
+        return get_country_codes()[country_name]
+    except KeyError:
+        return lookup_country_code(country_name)
+
+
+@functools.lru_cache(maxsize=1024)
+def lookup_country_code(country_name):
+    import pycountry
+
+    try:
+        return pycountry.countries.lookup(country_name).alpha_2
+    except LookupError:
+        return country_name
+
+
+if __name__ == '__main__':
+    write_country_codes()
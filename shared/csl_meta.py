@@ -1,8 +1,15 @@
+import collections
+import json
 import logging
 import os
 import urllib.request
 from urllib.error import HTTPError
 
+from azure.storage.blob import ContentSettings
+
+# Totals since this worker started, logged with every import for capacity planning.
+import_outcomes = collections.Counter()
+
 
 def get_meta_url(source_abbr):
     return f"{os.environ['META_HOST_URL']}/{os.environ['CSL_CONTAINER']}/{source_abbr}_meta.txt"
@@ -17,3 +24,34 @@ def get_meta_url_last_modified(source_abbr, encoding='utf-8'):
         logging.exception('Unable to read data from %s', meta_url)
 
     return last_modified
+
+
+def get_validators_url(source_abbr):
+    return f"{os.environ['META_HOST_URL']}/{os.environ['CSL_CONTAINER']}/{source_abbr}_validators.json"
+
+
+def get_validators(source_abbr, meta_fallback=True):
+    validators_url = get_validators_url(source_abbr)
+    try:
+        return json.loads(urllib.request.urlopen(validators_url).read().decode('utf-8'))
+    except HTTPError:
+        logging.info('No validators stored at %s', validators_url)
+
+    validators = {}
+    if meta_fallback:
+        last_modified = get_meta_url_last_modified(source_abbr)
+        if last_modified != 'N/A':
+            validators['last_modified'] = last_modified
+    return validators
+
+
+def upload_validators(blob_service_client, source_abbr, validators):
+    content_setting = ContentSettings(content_type='application/json')
+    blob_client = blob_service_client.get_blob_client(container=os.environ['CSL_CONTAINER'], blob=f"{source_abbr}_validators.json")
+    blob_client.upload_blob(json.dumps(validators), overwrite=True, content_settings=content_setting)
+
+
+def log_import_outcome(source_abbr, outcome, reason):
+    import_outcomes[outcome] += 1
+    logging.info(f"Import {outcome}: {source_abbr} ({reason}). Worker totals: "
+                 f"{import_outcomes['processed']} processed, {import_outcomes['skipped']} skipped")
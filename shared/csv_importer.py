@@ -0,0 +1,184 @@
+import csv
+import io
+import logging
+import os
+
+from azure.storage.blob import ContentSettings
+
+from . import convert_date, csl_meta, entity_id, output, request, storage
+
+csl_container = os.environ["CSL_CONTAINER"]
+
+# A spec describes one CSV list:
+#   source_abbr, source_name, url      what to download and where to write it
+#   user_agent                         defaults to request.DEFAULT_USER_AGENT
+#   encoding                           None to detect it, reusing the last import's
+#   delimiter                          defaults to ','
+#   expected_headers, headers_match    'exact' or 'subset' of the source headers
+#   key_columns                        rows sharing these columns are one entity,
+#   dedupe                             unless False, where every row gets its own ID
+#   address_columns, flat_address      one address per row, flat_address(row) for CSV
+#   fields                             the CSV/TSV row, in order
+#   json_fields                        set on the row for the JSON document
+#   json_moved_fields                  row fields dropped first, so their json_fields follow id
+# Field values are a column name, read from the entity's first row, or a function
+# of the Entry. Address column values are a column name, None or a function of the row.
+
+
+def run_import(spec):
+    source_abbr = spec['source_abbr']
+
+    logging.info('Checking last updated')
+    validators = csl_meta.get_validators(source_abbr)
+    response = request.urlopen_if_modified(spec['url'], validators, spec.get('user_agent', request.DEFAULT_USER_AGENT))
+    if response is None:
+        logging.info('Not modified since the last import. Skipping processing.')
+        csl_meta.log_import_outcome(source_abbr, 'skipped', 'not modified')
+        return 0
+    latest_modified = response.info()['Last-Modified']
+    if latest_modified == validators.get('last_modified'):
+        logging.info('No new data. Skipping processing.')
+        csl_meta.log_import_outcome(source_abbr, 'skipped', 'same last modified')
+        return 0
+
+    source, source_digest = request.read_source(response)
+    source_validators = request.get_validators(response, source_digest)
+    if source_digest == validators.get('digest'):
+        logging.info('Source content unchanged. Skipping processing.')
+        csl_meta.upload_validators(storage.get_blob_service_client(), source_abbr, source_validators)
+        csl_meta.log_import_outcome(source_abbr, 'skipped', 'same content')
+        return 0
+
+    logging.info('Processing data file')
+    encoding = spec.get('encoding')
+    if encoding:
+        entries = read_entries(spec, source, encoding)
+    else:
+        encoding = request.get_source_encoding(source, validators.get('encoding'))
+        try:
+            entries = read_entries(spec, source, encoding)
+        except UnicodeDecodeError:
+            # The sample did not cover the first byte outside the detected encoding.
+            source.seek(0)
+            encoding = request.detect_encoding(source, sample_size=None)
+            entries = read_entries(spec, source, encoding)
+        logging.info(f'Decoded data file as {encoding}')
+        source_validators['encoding'] = encoding
+
+    logging.info('Processing data')
+    blob_service_client = storage.get_blob_service_client()
+    output_writer = output.blob_output_writer(blob_service_client, csl_container, source_abbr)
+    for entry in entries:
+        doc = {'_id': entry.id, 'source': spec['source_name']}
+        for field, value in spec['fields'].items():
+            doc[field] = get_value(value, entry)
+        output_writer.write_row(doc)
+        doc['id'] = doc['_id']
+        del doc['_id']
+        for field in spec.get('json_moved_fields', ()):
+            del doc[field]
+        for field, value in spec.get('json_fields', {}).items():
+            doc[field] = get_value(value, entry)
+        output_writer.write_doc(doc)
+
+    entity_count = output_writer.close()
+    logging.info(f'Processed {entity_count} entries')
+    logging.info('Write last modified file')
+    content_setting = ContentSettings(content_type='text/plain')
+    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}_meta.txt")
+    blob_client.upload_blob(latest_modified, overwrite=True, content_settings=content_setting, metadata={'last_modified': latest_modified})
+    csl_meta.upload_validators(blob_service_client, source_abbr, source_validators)
+    csl_meta.log_import_outcome(source_abbr, 'processed', f'{entity_count} entries')
+
+
+def read_entries(spec, source, encoding):
+    # Rows are decoded as they are parsed, so only the entries are held in memory.
+    source_text = io.TextIOWrapper(source, encoding=encoding, newline='')
+    try:
+        csvfile = csv.DictReader(source_text, delimiter=spec.get('delimiter', ','))
+        logging.info('Checking header')
+        check_headers(spec, csvfile.fieldnames)
+
+        entries = {}
+        seen_ids = set()
+        for row in csvfile:
+            parts = [row[column] for column in spec['key_columns']]
+            if spec.get('dedupe', True):
+                id = entity_id.get_entity_id(*parts)
+            else:
+                id = entity_id.make_entity_id(seen_ids, spec['source_name'], *parts)
+            entry = entries.get(id)
+            if entry is None:
+                entry = entries[id] = Entry(id)
+            entry.add(spec, row)
+    finally:
+        source_text.detach()
+    return entries.values()
+
+
+def check_headers(spec, fieldnames):
+    expected_headers = spec['expected_headers']
+    source_csv_fields = set(filter(None, fieldnames or []))
+    if spec.get('headers_match', 'exact') == 'subset':
+        headers_match = expected_headers.issubset(source_csv_fields)
+    else:
+        headers_match = set(fieldnames or []) == expected_headers
+    if not headers_match:
+        logging.info(f'fields not in source {expected_headers.difference(source_csv_fields)}')
+        logging.info(f'new fields in source {source_csv_fields.difference(expected_headers)}')
+        raise ValueError("Actual headers differ from expected headers")
+
+
+class Entry:
+
+    def __init__(self, id):
+        self.id = id
+        self.rows = []
+        self.addresses = []
+        self.flat_addresses = []
+
+    @property
+    def row(self):
+        return self.rows[0]
+
+    def add(self, spec, row):
+        self.rows.append(row)
+        if 'address_columns' in spec:
+            self.addresses.append({
+                key: get_address_value(column, row)
+                for key, column in spec['address_columns'].items()
+            })
+            self.flat_addresses.append(spec['flat_address'](row))
+
+
+def get_value(value, entry):
+    if callable(value):
+        return value(entry)
+    return entry.row[value]
+
+
+def get_address_value(column, row):
+    if column is None:
+        return None
+    if callable(column):
+        return column(row)
+    return row[column]
+
+
+def constant(value):
+    return lambda entry: value
+
+
+def american_date(column):
+    def get_date(entry):
+        date = convert_date.parse_american_date(entry.row[column])
+        return date if date else None
+    return get_date
+
+
+def flat_addresses(entry):
+    return '; '.join(entry.flat_addresses)
+
+
+def addresses(entry):
+    return list(entry.addresses)
@@ -0,0 +1,31 @@
+import hashlib
+import logging
+
+
+# make_entity_id joins parts with the unit separator, so ('ab', 'c') and ('a', 'bc')
+# differ. get_entity_id keeps the plain concatenation the published DPL, EL and ISN IDs use.
+KEY_SEPARATOR = '\x1f'
+
+
+def get_key(*parts, separator=''):
+    return separator.join(part.lower().strip() for part in parts)
+
+
+# The ID of an entity merged from every row sharing the key.
+def get_entity_id(*parts):
+    return hashlib.sha224(get_key(*parts).encode()).hexdigest()
+
+
+# Like get_entity_id, but for lists where rows are kept as they are. Repeated keys
+# get a counter, so IDs stay stable as long as row order does.
+def make_entity_id(seen_ids, *parts):
+    key = get_key(*parts, separator=KEY_SEPARATOR)
+    entity_id = hashlib.sha224(key.encode()).hexdigest()
+    count = 1
+    while entity_id in seen_ids:
+        count += 1
+        entity_id = hashlib.sha224(f'{key}#{count}'.encode()).hexdigest()
+    if count > 1:
+        logging.warning(f'{count} entries share the key {key!r}')
+    seen_ids.add(entity_id)
+    return entity_id
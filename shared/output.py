@@ -1,3 +1,21 @@
+import base64
+import csv
+import hashlib
+import json
+import logging
+import os
+import uuid
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobBlock, ContentSettings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 output_fields = [
     '_id', 'source', 'entity_number', 'type',
     'programs', 'name', 'title', 'addresses',
@@ -9,3 +27,292 @@ output_fields = [
     'citizenships', 'dates_of_birth', 'nationalities', 'places_of_birth',
     'source_information_url', 'ids'
 ]
+
+# Outputs are staged as blocks of about this size, so no format is held in memory in full.
+block_size = 4 * 1024 * 1024
+# Blocks are staged on a shared pool, with a few in flight per blob so memory stays bounded.
+upload_max_workers = 8
+max_pending_blocks = 4
+upload_executor = ThreadPoolExecutor(max_workers=upload_max_workers)
+gzip_level = 6
+brotli_quality = 5
+
+
+def gzip_compressor():
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def brotli_compressor():
+    compressor = brotli.Compressor(quality=brotli_quality)
+    return compressor.process, compressor.finish
+
+
+# Every output is also published pre-compressed as <name>.<extension>, with its Content-Encoding.
+content_encodings = {'gz': ('gzip', gzip_compressor)}
+if brotli is not None:
+    content_encodings['br'] = ('br', brotli_compressor)
+
+
+class BlobSink:
+
+    def __init__(self, blob_client, content_type, content_encoding=None):
+        self.blob_client = blob_client
+        self.content_settings = ContentSettings(content_type=content_type, content_encoding=content_encoding)
+        self.block_prefix = uuid.uuid4().hex
+        self.block_list = []
+        self.pending_blocks = []
+        self.buffer = bytearray()
+
+    def write(self, text):
+        self.write_bytes(text.encode('utf-8'))
+
+    def write_bytes(self, data):
+        self.buffer += data
+        if len(self.buffer) >= block_size:
+            self.stage_block()
+
+    def stage_block(self):
+        block_id = f'{self.block_prefix}-{len(self.block_list):06d}'
+        block_id = base64.b64encode(block_id.encode()).decode()
+        self.pending_blocks.append(upload_executor.submit(self.blob_client.stage_block, block_id, bytes(self.buffer)))
+        self.block_list.append(BlobBlock(block_id=block_id))
+        self.buffer.clear()
+        if len(self.pending_blocks) >= max_pending_blocks:
+            self.pending_blocks.pop(0).result()
+
+    def flush(self):
+        if self.buffer:
+            self.stage_block()
+        for pending_block in self.pending_blocks:
+            pending_block.result()
+        self.pending_blocks.clear()
+
+    def close(self, metadata=None):
+        self.flush()
+        logging.info(f'Write {self.blob_client.blob_name} in {len(self.block_list)} blocks')
+        self.blob_client.commit_block_list(self.block_list, content_settings=self.content_settings, metadata=metadata)
+
+
+class LocalSink:
+
+    def __init__(self, path, content_type, content_encoding=None):
+        self.path = path
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.file = open(path, 'wb')
+
+    def write(self, text):
+        self.write_bytes(text.encode('utf-8'))
+
+    def write_bytes(self, data):
+        self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self, metadata=None):
+        self.file.close()
+        with open(f'{self.path}.metadata.json', 'w', encoding='utf-8') as f:
+            json.dump({'content_type': self.content_type, 'content_encoding': self.content_encoding, 'metadata': metadata}, f)
+
+
+class CompressingSink:
+
+    def __init__(self, sink, compress, finish):
+        self.sink = sink
+        self.compress = compress
+        self.finish = finish
+
+    def write(self, text):
+        self.write_bytes(text.encode('utf-8'))
+
+    def write_bytes(self, data):
+        compressed = self.compress(data)
+        if compressed:
+            self.sink.write_bytes(compressed)
+
+    def flush(self):
+        # Sinks are only flushed once their output is complete, so this ends the stream.
+        if self.finish is not None:
+            self.sink.write_bytes(self.finish())
+            self.finish = None
+        self.sink.flush()
+
+    def close(self, metadata=None):
+        self.flush()
+        self.sink.close(metadata)
+
+
+class MultiSink:
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def write(self, text):
+        self.write_bytes(text.encode('utf-8'))
+
+    def write_bytes(self, data):
+        for sink in self.sinks:
+            sink.write_bytes(data)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self, metadata=None):
+        for sink in self.sinks:
+            sink.close(metadata)
+
+
+def blob_sinks(blob_service_client, container):
+    def open_sink(blob_name, content_type, content_encoding=None):
+        blob_client = blob_service_client.get_blob_client(container=container, blob=blob_name)
+        return BlobSink(blob_client, content_type, content_encoding)
+    return open_sink
+
+
+def local_sinks(directory):
+    def open_sink(blob_name, content_type, content_encoding=None):
+        return LocalSink(os.path.join(directory, blob_name), content_type, content_encoding)
+    return open_sink
+
+
+def open_compressed_sinks(open_sink, blob_name, content_type):
+    return MultiSink([
+        CompressingSink(open_sink(f'{blob_name}.{extension}', content_type, content_encoding), *make_compressor())
+        for extension, (content_encoding, make_compressor) in content_encodings.items()
+    ])
+
+
+def open_output_sinks(open_sink, blob_name, content_type):
+    return MultiSink([
+        open_sink(blob_name, content_type),
+        open_compressed_sinks(open_sink, blob_name, content_type)
+    ])
+
+
+def get_entity_hash(doc_json):
+    return hashlib.sha256(doc_json.encode('utf-8')).hexdigest()
+
+
+def get_digest(entity_hashes):
+    lines = ''.join(f'{entity_id}:{entity_hash}\n' for entity_id, entity_hash in sorted(entity_hashes.items()))
+    return hashlib.sha256(lines.encode('utf-8')).hexdigest()
+
+
+def read_entity_hashes(blob_service_client, container, source_abbr):
+    blob_client = blob_service_client.get_blob_client(container=container, blob=f'{source_abbr}.hashes.json')
+    try:
+        return json.loads(blob_client.download_blob().readall())
+    except ResourceNotFoundError:
+        return None
+
+
+class OutputWriter:
+
+    # Alongside the outputs, {source}.delta.json lists the entities added, modified and removed
+    # since the import recorded in previous_hashes, the {source}.hashes.json that import wrote.
+    def __init__(self, source_abbr, open_sink, previous_hashes=None):
+        self.csv_sink = open_output_sinks(open_sink, f'{source_abbr}.csv', 'text/csv')
+        self.tsv_sink = open_output_sinks(open_sink, f'{source_abbr}.tsv', 'text/tsv')
+        self.json_sink = open_output_sinks(open_sink, f'{source_abbr}.json', 'application/json')
+        self.delta_sink = open_output_sinks(open_sink, f'{source_abbr}.delta.json', 'application/json')
+        self.hashes_sink = open_sink(f'{source_abbr}.hashes.json', 'application/json')
+        self.csv_writer = csv.DictWriter(self.csv_sink, fieldnames=output_fields, dialect='unix')
+        self.tsv_writer = csv.DictWriter(self.tsv_sink, fieldnames=output_fields, dialect='unix', delimiter='\t')
+        self.csv_writer.writeheader()
+        self.tsv_writer.writeheader()
+        self.json_sink.write('[')
+        self.delta_sink.write('{"changes": [')
+        self.entity_count = 0
+        self.previous_hashes = previous_hashes
+        self.entity_hashes = {}
+        self.change_counts = {'added': 0, 'modified': 0, 'removed': 0}
+
+    def write(self, row, doc):
+        self.write_row(row)
+        self.write_doc(doc)
+
+    def write_row(self, row):
+        self.csv_writer.writerow(row)
+        self.tsv_writer.writerow(row)
+
+    def write_doc(self, doc):
+        doc_json = json.dumps(doc)
+        if self.entity_count:
+            self.json_sink.write(', ')
+        self.json_sink.write(doc_json)
+        self.entity_count += 1
+
+        entity_id = str(doc.get('id') or doc.get('entity_number'))
+        entity_hash = get_entity_hash(doc_json)
+        self.entity_hashes[entity_id] = entity_hash
+        if self.previous_hashes is None:
+            return
+        previous_hash = self.previous_hashes['hashes'].get(entity_id)
+        if previous_hash is None:
+            self.write_change('added', entity_id, entity_hash, doc_json)
+        elif previous_hash != entity_hash:
+            self.write_change('modified', entity_id, entity_hash, doc_json)
+
+    def write_change(self, change, entity_id, entity_hash, doc_json=None):
+        if any(self.change_counts.values()):
+            self.delta_sink.write(', ')
+        change_json = json.dumps({'change': change, 'id': entity_id, 'hash': entity_hash})
+        if doc_json is not None:
+            change_json = f'{change_json[:-1]}, "entity": {doc_json}}}'
+        self.delta_sink.write(change_json)
+        self.change_counts[change] += 1
+
+    def close(self):
+        self.json_sink.write(']')
+
+        digest = get_digest(self.entity_hashes)
+        previous_digest = None
+        if self.previous_hashes is not None:
+            previous_digest = self.previous_hashes['digest']
+            for entity_id, previous_hash in self.previous_hashes['hashes'].items():
+                if entity_id not in self.entity_hashes:
+                    self.write_change('removed', entity_id, previous_hash)
+        # Without a previous import to compare with, consumers have to reload the list.
+        delta_summary = {
+            'reload': self.previous_hashes is None,
+            'previous_digest': previous_digest,
+            'digest': digest,
+            **self.change_counts
+        }
+        self.delta_sink.write(f'], {json.dumps(delta_summary)[1:]}')
+        json.dump({'digest': digest, 'hashes': self.entity_hashes}, self.hashes_sink)
+        logging.info(f'Changes since the last import: {self.change_counts}')
+
+        sinks = [
+            (self.csv_sink, None),
+            (self.tsv_sink, None),
+            (self.json_sink, {'entity_count': str(self.entity_count), 'digest': digest}),
+            (self.delta_sink, {'previous_digest': previous_digest or '', 'digest': digest})
+        ]
+        # All outputs are staged first. The lists and the delta are committed together, and
+        # the hashes only once they all are, so after a failed upload the next run still
+        # diffs against the hashes of the last complete import. Callers write meta files
+        # only after this returns.
+        for sink, _ in sinks:
+            sink.flush()
+        self.hashes_sink.flush()
+        with ThreadPoolExecutor(max_workers=len(sinks)) as executor:
+            closing = [executor.submit(sink.close, metadata) for sink, metadata in sinks]
+        for sink_closed in closing:
+            sink_closed.result()
+        self.hashes_sink.close({'digest': digest})
+        return self.entity_count
+
+
+def blob_output_writer(blob_service_client, container, source_abbr):
+    previous_hashes = read_entity_hashes(blob_service_client, container, source_abbr)
+    return OutputWriter(source_abbr, blob_sinks(blob_service_client, container), previous_hashes)
+
+
+def write_outputs(output_writer, entries):
+    for row, doc in entries:
+        output_writer.write(row, doc)
+    return output_writer.close()
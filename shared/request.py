@@ -1,15 +1,69 @@
+import codecs
+import hashlib
 import os
+import tempfile
 import urllib.request
-import chardet
+
+from urllib.error import HTTPError
 
 DEFAULT_USER_AGENT = os.environ['DEFAULT_USER_AGENT']
+SOURCE_CHUNK_SIZE = 1024 * 1024
+ENCODING_CHUNK_SIZE = 16 * 1024
+ENCODING_SAMPLE_SIZE = 256 * 1024
+
+def urlopen_if_modified(url, validators, user_agent=DEFAULT_USER_AGENT):
+    headers = {}
+    if user_agent:
+        headers['User-Agent'] = user_agent
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    req = urllib.request.Request(url, data=None, headers=headers)
+    try:
+        return urllib.request.urlopen(req)
+    except HTTPError as e:
+        if e.code != 304:
+            raise
+        e.close()
+        return None
+
+def read_source(response):
+    # The body is hashed as it is spooled to disk, so an unchanged source can be skipped
+    # before parsing. A real file because SpooledTemporaryFile only supports io.TextIOWrapper
+    # from Python 3.11.
+    source = tempfile.TemporaryFile()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: response.read(SOURCE_CHUNK_SIZE), b''):
+        digest.update(chunk)
+        source.write(chunk)
+    source.seek(0)
+    return source, digest.hexdigest()
+
+def get_validators(response, digest=None):
+    return {
+        'etag': response.info()['ETag'],
+        'last_modified': response.info()['Last-Modified'],
+        'digest': digest
+    }
+
+def detect_encoding(source, sample_size=ENCODING_SAMPLE_SIZE):
+    from chardet.universaldetector import UniversalDetector
 
-def urlopen_with_user_agent(url, user_agent=DEFAULT_USER_AGENT):
-    req = urllib.request.Request(url,
-                                 data=None,
-                                 headers={'User-Agent': user_agent})
-    return urllib.request.urlopen(req)
+    detector = UniversalDetector()
+    read_size = 0
+    for chunk in iter(lambda: source.read(ENCODING_CHUNK_SIZE), b''):
+        detector.feed(chunk)
+        read_size += len(chunk)
+        if detector.done or (sample_size is not None and read_size >= sample_size):
+            break
+    detector.close()
+    source.seek(0)
+    return detector.result['encoding']
 
-def detect_encoding(url, user_agent=DEFAULT_USER_AGENT):
-    response = urlopen_with_user_agent(url, user_agent)
-    return chardet.detect(response.read())['encoding']
+def get_source_encoding(source, encoding=None):
+    # A clean decode only confirms an encoding from the last import when it is UTF-8,
+    # since single-byte encodings decode anything, so other hints are detected again.
+    if encoding is None or codecs.lookup(encoding).name not in ('utf-8', 'ascii'):
+        return detect_encoding(source)
+    return encoding
@@ -0,0 +1,10 @@
+import functools
+import os
+
+from azure.storage.blob import BlobServiceClient
+
+
+# Function invocations on a warm worker share one client and its connection pool.
+@functools.lru_cache(maxsize=None)
+def get_blob_service_client():
+    return BlobServiceClient.from_connection_string(os.environ["CONNECTION_STRING"])
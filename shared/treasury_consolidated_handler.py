@@ -1,5 +1,4 @@
-import xml.etree.ElementTree as ET
-
+from ..sanctions_list_parser import xml_parser
 from . import citizenship, convert_date, name_extractor, nested_fields
 
 
@@ -22,8 +21,7 @@ NULL_FIELDS = [
 
 
 def entries(response):
-    tree = ET.parse(response)
-    root = tree.getroot()
+    root = xml_parser.get_root(response)
     return root.findall('xmlns:sdnEntry', NS)
 
 
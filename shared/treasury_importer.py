@@ -1,19 +1,13 @@
-import csv
-import json
 import os
 import logging
 
-import urllib.request
+from azure.storage.blob import ContentSettings
 
-from azure.storage.blob import BlobServiceClient, ContentSettings
-from io import StringIO
+from . import csl_meta, nested_fields, output, request, storage, treasury_metadata
 
-from . import csl_meta, nested_fields, output, treasury_metadata
+from ..sanctions_list_parser import StreamingTreasuryProcessor, TreasuryProcessor, parallel_transformer
 
-from ..sanctions_list_parser import TreasuryProcessor
 
-
-connection_string = os.environ["CONNECTION_STRING"]
 csl_container = os.environ["CSL_CONTAINER"]
 
 null_fields = [
@@ -27,44 +21,100 @@ null_fields = [
 
 
 def run_import(source_abbr):
-    logging.info('Checking last updated')
-    last_modified = csl_meta.get_meta_url_last_modified(source_abbr)
+    run_imports([source_abbr])
+
+
+def run_consolidated_import():
+    run_imports(treasury_metadata.get_source_abbrs(treasury_metadata.NON_SDN_SOURCE_URL))
+
 
-    source_metadata = treasury_metadata.get_treasury_metadata(source_abbr)
+def run_imports(source_abbrs):
+    source_metadata_dict = {
+        source_abbr: treasury_metadata.get_treasury_metadata(source_abbr)
+        for source_abbr in source_abbrs
+    }
+    source_urls = {source_metadata['source_url'] for source_metadata in source_metadata_dict.values()}
+    if len(source_urls) != 1:
+        raise ValueError(f'Sources {source_abbrs} do not share a single source url')
+    source_url = source_urls.pop()
+
+    logging.info('Checking last updated')
+    validators_dict = {
+        source_abbr: csl_meta.get_validators(source_abbr)
+        for source_abbr in source_abbrs
+    }
+    validators_list = list(validators_dict.values())
+    # A conditional request only answers for all lists when they were last imported together.
+    validators = validators_list[0] if all(v == validators_list[0] for v in validators_list) else {}
 
     logging.info('Requesting data file')
-    response = urllib.request.urlopen(source_metadata['source_url'])
+    response = request.urlopen_if_modified(source_url, validators, user_agent=None)
+    if response is None:
+        logging.info('Not modified since the last import. Skipping processing.')
+        log_import_outcomes(source_abbrs, 'skipped', 'not modified')
+        return 0
     latest_modified = response.info()['Last-Modified']
-    if last_modified == latest_modified:
+    if all(v.get('last_modified') == latest_modified for v in validators_list):
         logging.info('No new data. Skipping processing.')
+        log_import_outcomes(source_abbrs, 'skipped', 'same last modified')
         return 0
 
-    list_id = source_metadata['list_id']
-    logging.info(f'Processing {source_abbr} data with list_id {list_id}')
-    processor = TreasuryProcessor(response)
-    sanctions_entries = processor.get_sanctions_entries(list_id)
-
-    csv_output = StringIO()
-    tsv_output = StringIO()
-    json_output = StringIO()
-    csv_writer = csv.DictWriter(csv_output, fieldnames=output.output_fields, dialect='unix')
-    tsv_writer = csv.DictWriter(tsv_output, fieldnames=output.output_fields, dialect='unix', delimiter='\t')
-    csv_writer.writeheader()
-    tsv_writer.writeheader()
-    doc_list = []
-
-    source_info = {
-        'source': source_metadata['source'],
-        'source_information_url': source_metadata['list_information_url'],
-        'source_list_url': source_metadata['list_url']
+    source, source_digest = request.read_source(response)
+    source_validators = request.get_validators(response, source_digest)
+    if all(v.get('digest') == source_digest for v in validators_list):
+        logging.info('Source content unchanged. Skipping processing.')
+        blob_service_client = storage.get_blob_service_client()
+        for source_abbr in source_abbrs:
+            csl_meta.upload_validators(blob_service_client, source_abbr, source_validators)
+        log_import_outcomes(source_abbrs, 'skipped', 'same content')
+        return 0
+
+    list_id_dict = {
+        source_metadata['list_id']: source_abbr
+        for source_abbr, source_metadata in source_metadata_dict.items()
+    }
+    logging.info(f'Processing {source_abbrs} data with list_ids {list(list_id_dict)}')
+    blob_service_client = storage.get_blob_service_client()
+    list_outputs = {
+        list_id: ListOutput(source_abbr, output.blob_output_writer(blob_service_client, csl_container, source_abbr))
+        for list_id, source_abbr in list_id_dict.items()
     }
+    # Parallel transformation needs the whole document parsed first, streaming keeps memory flat.
+    workers = parallel_transformer.get_worker_count()
+    processor = TreasuryProcessor(source, workers) if workers > 1 else StreamingTreasuryProcessor(source)
+    for list_id, sanctions_entry in processor.iter_sanctions_entries(list_id_dict.keys()):
+        list_outputs[list_id].write(sanctions_entry)
+
+    entity_counts = {list_output.source_abbr: list_output.close() for list_output in list_outputs.values()}
+    for list_output in list_outputs.values():
+        list_output.upload_meta(blob_service_client, latest_modified)
+        csl_meta.upload_validators(blob_service_client, list_output.source_abbr, source_validators)
+    for source_abbr, entity_count in entity_counts.items():
+        csl_meta.log_import_outcome(source_abbr, 'processed', f'{entity_count} entries')
+
+
+def log_import_outcomes(source_abbrs, outcome, reason):
+    for source_abbr in source_abbrs:
+        csl_meta.log_import_outcome(source_abbr, outcome, reason)
+
+
+class ListOutput:
+
+    def __init__(self, source_abbr, output_writer):
+        self.source_abbr = source_abbr
+        source_metadata = treasury_metadata.get_treasury_metadata(source_abbr)
+        self.source_info = {
+            'source': source_metadata['source'],
+            'source_information_url': source_metadata['list_information_url'],
+            'source_list_url': source_metadata['list_url']
+        }
+        self.output_writer = output_writer
 
-    for sanctions_entry in sanctions_entries:
-        sanctions_entry.update(source_info)
+    def write(self, sanctions_entry):
+        sanctions_entry.update(self.source_info)
 
         doc = dict(sorted(sanctions_entry.items()))
-        doc_copy = doc.copy()
-        doc_list.append(doc_copy)
+        self.output_writer.write_doc(doc)
 
         addresses = doc.get('addresses') or []
         doc['addresses'] = nested_fields.make_flat_address(addresses)
@@ -80,32 +130,19 @@ def run_import(source_abbr):
         for d in doc['ids']:
             id_list.append(", ".join([v for v in d.values() if v]))
         doc['ids'] = "; ".join(id_list)
-        tsv_writer.writerow(doc)
-        csv_writer.writerow(doc)
-
-    json.dump(doc_list, json_output)
-
-    blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-    logging.info('Write csv file')
-    content_setting = ContentSettings(content_type='text/csv')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}.csv")
-    blob_client.upload_blob(csv_output.getvalue(), overwrite=True, content_settings=content_setting)
-    csv_output.close()
-    logging.info('Write tsv file')
-    content_setting = ContentSettings(content_type='text/tsv')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}.tsv")
-    blob_client.upload_blob(tsv_output.getvalue(), overwrite=True, content_settings=content_setting)
-    tsv_output.close()
-    logging.info('Write json file')
-    content_setting = ContentSettings(content_type='application/json')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}.json")
-    blob_client.upload_blob(json_output.getvalue(), overwrite=True, content_settings=content_setting)
-    json_output.close()
-    logging.info('Write last modified file')
-    content_setting = ContentSettings(content_type='text/plain')
-    blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}_meta.txt")
-    blob_client.upload_blob(latest_modified, overwrite=True, content_settings=content_setting)
-    json_output.close()
+        self.output_writer.write_row(doc)
+
+    def close(self):
+        entity_count = self.output_writer.close()
+        logging.info(f'Wrote {entity_count} {self.source_abbr} entries')
+        return entity_count
+
+    def upload_meta(self, blob_service_client, latest_modified):
+        source_abbr = self.source_abbr
+        logging.info('Write last modified file')
+        content_setting = ContentSettings(content_type='text/plain')
+        blob_client = blob_service_client.get_blob_client(container=csl_container, blob=f"{source_abbr}_meta.txt")
+        blob_client.upload_blob(latest_modified, overwrite=True, content_settings=content_setting, metadata={'last_modified': latest_modified})
 
 
 def flatten_array(doc, key):
@@ -48,3 +48,11 @@ SOURCES_DICT = {
 
 def get_treasury_metadata(source_abbr):
     return SOURCES_DICT[source_abbr]
+
+
+def get_source_abbrs(source_url):
+    return [
+        source_abbr
+        for source_abbr, source_metadata in SOURCES_DICT.items()
+        if source_metadata['source_url'] == source_url
+    ]